@@ -1,99 +1,301 @@
 """The SDM630 integration."""
 
+import asyncio
 import logging
+import math
+import time
+from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
-from datetime import timedelta
+from pymodbus.exceptions import (
+    ConnectionException,
+    ModbusException,
+    ModbusIOException,
+)
 
+from .arbiter import PRIORITY_NORMAL, BusArbiter
+from .capture import CaptureWriter
 from .const import (
-    DOMAIN,
+    CAPTURE_BACKUPS,
     CONF_BAUDRATE,
     CONF_BYTESIZE,
+    CONF_CAPABILITY_PROFILE,
+    CONF_CAPTURE,
+    CONF_CAPTURE_MAX_SIZE,
     CONF_CONNECTION_TYPE,
+    CONF_FAST_INTERVAL,
     CONF_HOST,
+    CONF_MAX_REGISTERS,
+    CONF_MEDIUM_INTERVAL,
     CONF_PARITY,
     CONF_PORT,
+    CONF_REGISTER_SET,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLED_REGISTERS,
     CONF_SERIAL_PORT,
     CONF_SLAVE_ID,
+    CONF_SLOW_INTERVAL,
+    CONF_STALE_AFTER,
     CONF_STOPBITS,
-    CONF_REGISTER_SET,
+    CONF_TCP_CONNECTIONS,
     CONF_UPDATE_INTERVAL,
     CONNECTION_TYPE_SERIAL,
     DEFAULT_BAUDRATE,
     DEFAULT_BYTESIZE,
+    DEFAULT_CAPTURE,
+    DEFAULT_CAPTURE_MAX_SIZE,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_MAX_REGISTERS,
+    DEFAULT_MEDIUM_INTERVAL,
     DEFAULT_PARITY,
     DEFAULT_REGISTER_SET,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SAMPLED_REGISTERS,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_STALE_AFTER,
     DEFAULT_STOPBITS,
-    REGISTER_SETS,
+    DEFAULT_TCP_CONNECTIONS,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    OPTION_DEFAULTS,
+    PROFILE_FALLBACK_ERRORS,
+    PROFILE_REPROBE_INTERVAL,
     REGISTER_SET_BASIC,
+    REGISTER_SET_FULL,
+    REGISTER_SETS,
+    SIGNAL_FAST_VALUES,
+    TIER_MEDIUM,
+    TIER_SLOW,
 )
 from .coordinator import HA_SDM630Coordinator
+from .metrics import HubMetrics
+from .planner import REGISTERS_PER_VALUE, async_probe_max_registers, probe_window
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR]
 
+# Modbus RTU: fixed 1.75 ms silent interval above 19200 baud, 3.5 characters below
+RTU_FAST_BAUDRATE = 19200
+RTU_FAST_SILENT_INTERVAL = 0.00175
+RTU_MAX_FRAME_BYTES = 256
+
+# Adaptive settling gap for TCP gateways
+TCP_GAP_STEP = 0.01
+TCP_MAX_GAP = 0.5
+TCP_GAP_DECAY_AFTER = 20  # successful frames before halving the gap
+TCP_MIN_RESET_DELAY = 0.1
+
+# Protocol errors in a row (across blocks) before the link is considered broken
+TRANSPORT_ERROR_THRESHOLD = 3
+
+# pymodbus reports a response timeout only through the message of a ModbusIOException
+NO_RESPONSE_MESSAGE = "No response received"
+
+# Response timeouts learned from the hub's round trip times
+TIMEOUT_FACTOR = 3  # times the p99 latency
+TIMEOUT_MIN = 0.3
+TIMEOUT_MAX = 15.0
+TIMEOUT_MIN_SAMPLES = 20  # answers before leaving DEFAULT_REQUEST_TIMEOUT
+TIMEOUT_UPDATE_EVERY = 20  # answers between recomputations
+OFFLINE_AFTER = 3  # unanswered requests in a row before a slave counts as offline
+
+# Options applied to a running entry in place, any other change reloads it
+HOT_OPTIONS = {
+    CONF_REGISTER_SET,
+    CONF_UPDATE_INTERVAL,
+    CONF_MEDIUM_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_STALE_AFTER,
+    CONF_FAST_INTERVAL,
+}
+
+# Seconds between the first polls of meters sharing a hub, so startup doesn't flood the bus
+STARTUP_STAGGER = 2.0
+
+
+def _is_no_response(err: ModbusException) -> bool:
+    """Return True if err is a plain response timeout, nothing came back."""
+    return isinstance(err, ModbusIOException) and NO_RESPONSE_MESSAGE in str(err)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SDM630 from a config entry."""
     config = entry.data
     connection_type = config.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_SERIAL)
-    
-    # Use options for the register set so users can change it without reinstalling
-    register_set_key = entry.options.get(CONF_REGISTER_SET, DEFAULT_REGISTER_SET)
-    selected_registers = REGISTER_SETS.get(register_set_key, REGISTER_SETS[REGISTER_SET_BASIC])
+
+    register_set_key = _register_set_key(entry)
 
     # Get or create shared hub for this connection
     hubs = hass.data.setdefault(DOMAIN, {}).setdefault("hubs", {})
-    
+
     if connection_type == CONNECTION_TYPE_SERIAL:
         port = config[CONF_SERIAL_PORT]
         baudrate = config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)
         parity = config.get(CONF_PARITY, DEFAULT_PARITY)
         stopbits = config.get(CONF_STOPBITS, DEFAULT_STOPBITS)
         bytesize = config.get(CONF_BYTESIZE, DEFAULT_BYTESIZE)
-        hub_key = f"serial_{port}_{baudrate}_{parity}_{stopbits}_{bytesize}"
-        
+        hub_key = _hub_key(config)
+
         if hub_key not in hubs:
             hubs[hub_key] = SDM630SerialHub(hass, port, baudrate, parity, stopbits, bytesize)
     else:  # TCP
         host = config[CONF_HOST]
         port = config[CONF_PORT]
-        hub_key = f"tcp_{host}_{port}"
-        
+        hub_key = _hub_key(config)
+        connections = entry.options.get(CONF_TCP_CONNECTIONS, DEFAULT_TCP_CONNECTIONS)
+
         if hub_key not in hubs:
-            hubs[hub_key] = SDM630TcpHub(hass, host, port)
+            hubs[hub_key] = SDM630TcpHub(hass, host, port, connections)
+        else:
+            hubs[hub_key].grow_pool(connections)
 
     hub = hubs[hub_key]
-    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, 10)
-    # Create coordinator with shared client and selected registers
+    # A shared bus is limited by the most restrictive meter/gateway on it
+    hub.set_register_cap(
+        entry.entry_id, entry.options.get(CONF_MAX_REGISTERS, DEFAULT_MAX_REGISTERS)
+    )
+    # Reuse the block size probed on an earlier connect
+    if CONF_CAPABILITY_PROFILE in config:
+        hub.apply_profile(config[CONF_CAPABILITY_PROFILE])
+
+    @callback
+    def _async_save_profile(profile: dict) -> None:
+        """Persist the hub's capability profile in this entry."""
+        if entry.data.get(CONF_CAPABILITY_PROFILE) != profile:
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_CAPABILITY_PROFILE: profile}
+            )
+
+    entry.async_on_unload(hub.async_add_profile_listener(_async_save_profile))
+    if hub.profile is not None:
+        _async_save_profile(hub.profile)
+
+    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    # Create coordinator with shared hub and selected registers
     coordinator = HA_SDM630Coordinator(
         hass,
-        hub.client,
+        hub,
         config[CONF_SLAVE_ID],
-        selected_registers,
-        timedelta(seconds=update_interval)
+        register_set_key,
+        timedelta(seconds=update_interval),
+        tier_intervals=_tier_intervals(entry),
+        stale_after=entry.options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER),
+        sample_interval=entry.options.get(
+            CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+        ),
+        sampled_keys=entry.options.get(
+            CONF_SAMPLED_REGISTERS, DEFAULT_SAMPLED_REGISTERS
+        ),
+        fast_interval=entry.options.get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
     )
-    # Store config and hub_key for unload cleanup
+    # Store config, options and hub_key for unload cleanup
     coordinator.config = config
+    coordinator.options = dict(entry.options)
     coordinator.hub_key = hub_key
+    # Hub metrics are the same for every meter on it, only the hub's first entry shows them
+    coordinator.hub_diagnostics = entry.entry_id == min(
+        other.entry_id
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.disabled_by is None and _hub_key(other.data) == hub_key
+    )
+    coordinator.fast_signal = SIGNAL_FAST_VALUES.format(entry.entry_id)
 
-    entry.async_on_unload(entry.add_update_listener(update_listener))
+    if entry.options.get(CONF_CAPTURE, DEFAULT_CAPTURE):
+        # Raw reads for troubleshooting, see capture.py for the format and a reader
+        coordinator.capture = CaptureWriter(
+            hass.config.path(DOMAIN, f"capture_{entry.entry_id}.sdmcap"),
+            entry.options.get(CONF_CAPTURE_MAX_SIZE, DEFAULT_CAPTURE_MAX_SIZE)
+            * 1_000_000,
+            CAPTURE_BACKUPS,
+        )
 
-    # First data refresh
-    await coordinator.async_config_entry_first_refresh()
+    # Only poll registers whose entity is enabled, follow the user enabling/disabling them
+    registry = er.async_get(hass)
+    coordinator.set_enabled_keys(
+        _async_enabled_keys(registry, entry, coordinator.register_map)
+    )
+
+    @callback
+    def _async_registry_updated(event: Event) -> None:
+        action = event.data["action"]
+        if action not in ("create", "update"):
+            return
+        if action == "update" and "disabled_by" not in event.data["changes"]:
+            return
+        entity_entry = registry.async_get(event.data["entity_id"])
+        if entity_entry is None or entity_entry.config_entry_id != entry.entry_id:
+            return
+        key = entity_entry.unique_id.removeprefix(f"{entry.entry_id}_")
+        if key not in coordinator.register_map:
+            return
+        enabled = coordinator.enabled_keys
+        coordinator.set_enabled_keys(
+            enabled - {key} if entity_entry.disabled else enabled | {key}
+        )
+        _LOGGER.debug(
+            "Now polling %s registers for %s",
+            len(coordinator.enabled_keys),
+            entry.title,
+        )
+
+    entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, _async_registry_updated)
+    )
+
+    entry.async_on_unload(entry.add_update_listener(update_listener))
 
     # Store coordinator
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Forward to sensor platform
+    # Entities start with their restored state, the first poll doesn't hold up startup
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    startup_delay = hub.startup_delay()
+
+    async def _async_start() -> None:
+        await asyncio.sleep(startup_delay)
+        await coordinator.async_refresh()
+        # From now on polled in the hub's cycle, together with the other meters on the bus
+        entry.async_on_unload(hub.async_add_coordinator(coordinator))
+        # Both read with the block size the first poll probed
+        loops = [coordinator.async_run_fast_path()]
+        if coordinator.sample_interval:
+            # Runs even without sampled keys, a register set change may bring some
+            loops.append(coordinator.async_run_sampler())
+        await asyncio.gather(*loops)
+
+    # Cancelled automatically when the entry unloads
+    entry.async_create_background_task(
+        hass, _async_start(), f"{DOMAIN} poller start {entry.title}"
+    )
+
     return True
 
+
+@callback
+def _async_enabled_keys(
+    registry: er.EntityRegistry, entry: ConfigEntry, register_map: dict
+) -> set:
+    """Return the register keys whose sensor is (or will be created) enabled."""
+    enabled = set()
+    for key, info in register_map.items():
+        entity_id = registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, f"{entry.entry_id}_{key}"
+        )
+        if entity_id is None:
+            if info.get("enabled_default", True):
+                enabled.add(key)
+        elif not registry.async_get(entity_id).disabled:
+            enabled.add(key)
+    return enabled
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -105,6 +307,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not coordinator:
         return True  # Already cleaned up
 
+    coordinator.hub.remove_register_cap(entry.entry_id)
     hub_key = getattr(coordinator, "hub_key", None)
     if not hub_key:
         return True
@@ -122,7 +325,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             try:
                 await hub.close()
                 _LOGGER.debug("Closed shared hub %s during unload", hub_key)
-            except Exception as err:
+            except Exception as err:  # noqa: BLE001 - unload goes on regardless
                 _LOGGER.warning("Error closing hub %s: %s", hub_key, err)
 
     return True
@@ -130,10 +333,510 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if coordinator is not None and coordinator.options == entry.options:
+        return  # Only entry data changed (e.g. the persisted capability profile)
+    old, new = coordinator.options if coordinator is not None else {}, entry.options
+    # An option missing on one side still has its default there
+    changed = {
+        key
+        for key in old.keys() | new.keys()
+        if old.get(key, OPTION_DEFAULTS.get(key))
+        != new.get(key, OPTION_DEFAULTS.get(key))
+    }
+    if coordinator is None or changed - HOT_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # Polling options only: replan in place, the hub and the other meters carry on
+    register_set_key = _register_set_key(entry)
+    coordinator.reconfigure(
+        register_set_key,
+        timedelta(seconds=new.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)),
+        _tier_intervals(entry),
+        new.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER),
+        new.get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
+    )
+    coordinator.set_enabled_keys(
+        _async_enabled_keys(er.async_get(hass), entry, coordinator.register_map)
+    )
+    coordinator.options = dict(new)
+    _LOGGER.debug(
+        "Applied %s to %s without reloading", ", ".join(sorted(changed)), entry.title
+    )
+
+
+def _hub_key(config) -> str:
+    """Key of the shared hub (bus or gateway) of a config entry's data."""
+    if (
+        config.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_SERIAL)
+        == CONNECTION_TYPE_SERIAL
+    ):
+        settings = (
+            config[CONF_SERIAL_PORT],
+            config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+            config.get(CONF_PARITY, DEFAULT_PARITY),
+            config.get(CONF_STOPBITS, DEFAULT_STOPBITS),
+            config.get(CONF_BYTESIZE, DEFAULT_BYTESIZE),
+        )
+        return "_".join(["serial", *map(str, settings)])
+    return f"tcp_{config[CONF_HOST]}_{config[CONF_PORT]}"
+
+
+def _register_set_key(entry: ConfigEntry) -> str:
+    # Use options for the register set so users can change it without reinstalling
+    register_set_key = entry.options.get(CONF_REGISTER_SET, DEFAULT_REGISTER_SET)
+    return register_set_key if register_set_key in REGISTER_SETS else REGISTER_SET_BASIC
+
+
+def _tier_intervals(entry: ConfigEntry) -> dict:
+    return {
+        TIER_MEDIUM: entry.options.get(CONF_MEDIUM_INTERVAL, DEFAULT_MEDIUM_INTERVAL),
+        TIER_SLOW: entry.options.get(CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL),
+    }
+
+
+class SDM630Hub:
+    """Shared connection state and gateway capability profile."""
+
+    client = None
+    # Frame sizes for the bytes-on-the-wire counters (RTU: address, function, CRC)
+    request_frame_bytes = 8
+    response_overhead_bytes = 5
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        # Block size: the lowest user cap of the meters on this hub, limited
+        # by what the device/gateway reads reliably (None until known)
+        self.max_registers = DEFAULT_MAX_REGISTERS
+        self.device_max_registers = None
+        self._register_caps = {}  # entry ID -> CONF_MAX_REGISTERS
+        self.profile = None  # {"max_registers": n, "max_connections": n} once probed
+        # One queue per physical bus, one transaction in flight per connection
+        self.arbiter = BusArbiter()
+        self._pool = []
+        self._idle = []
+        self._probe_lock = asyncio.Lock()
+        self._size_failures = 0
+        self._probe_window = probe_window(REGISTER_SETS[REGISTER_SET_FULL])
+        self._probed_up_to = (
+            0  # Probe reached this cap without finding the device limit
+        )
+        self._next_probe = 0.0  # Monotonic time of the next upward re-probe
+        self._profile_listeners = []
+        # Pacing: minimum quiet time between frames and after errors
+        self.frame_gap = 0.0
+        self.reset_delay = 0.5
+        self._last_frame_end = 0.0
+        self._next_startup = 0.0
+        self._protocol_errors = 0
+        self.metrics = HubMetrics()
+        # Response timeouts, see _update_timeouts()
+        self.timeout = DEFAULT_REQUEST_TIMEOUT
+        self.offline_timeout = DEFAULT_REQUEST_TIMEOUT
+        # slave ID -> factor on the timeout after unanswered requests
+        self._timeout_backoff = {}
+        self._unanswered = {}  # slave ID -> unanswered requests in a row
+        # One aligned poll cycle for all meters on the hub, see async_add_coordinator()
+        self._coordinators = set()
+        self._cycle_task = None
+
+    def _init_pool(self, clients: list) -> None:
+        """Use these clients for transactions, one transaction per client at a time."""
+        self.client = clients[0]  # Primary connection, always kept
+        self._pool = list(clients)
+        self._idle = list(clients)
+        self.arbiter.max_outstanding = len(clients)
+
+    async def _async_connect_client(self, client) -> bool:
+        try:
+            if not client.connected:
+                # pymodbus uses the same setting for connecting, don't give that the learned timeout
+                self._apply_timeout(client, max(self.timeout, DEFAULT_REQUEST_TIMEOUT))
+                await client.connect()
+            return client.connected
+        except Exception as err:  # noqa: BLE001 - retried on the next update
+            _LOGGER.debug("Failed to connect to SDM630: %s", err)
+            return False
+
+    async def async_connect(self) -> bool:
+        """Connect the shared client(s) if needed."""
+        if not await self._async_connect_client(self.client):
+            return False
+        for client in [client for client in self._idle if client is not self.client]:
+            if not await self._async_connect_client(client):
+                # The gateway accepts the primary but not this many sockets
+                self._retire_client(client)
+        return True
+
+    def _retire_client(self, client) -> None:
+        """Drop an extra pooled connection the gateway does not accept."""
+        client.close()
+        self._pool.remove(client)
+        self._idle.remove(client)
+        self.arbiter.max_outstanding = len(self._pool)
+        _LOGGER.info("SDM630 gateway limited to %s connection(s)", len(self._pool))
+        self._async_update_profile(max_connections=len(self._pool))
+
+    async def _async_reset(self, client) -> None:
+        """Drop and reopen a connection, only used for genuine transport errors."""
+        client.close()
+        self.metrics.reconnects += 1
+        await self._async_sleep(self.reset_delay)
+        await self._async_connect_client(client)
+
+    @callback
+    def async_add_coordinator(self, coordinator):
+        """Poll coordinator in the hub's cycle, returns a function that removes it."""
+        self._coordinators.add(coordinator)
+        if self._cycle_task is None:
+            self._cycle_task = self.hass.async_create_background_task(
+                self._async_run_cycles(), f"{DOMAIN} hub poll cycle"
+            )
+
+        @callback
+        def remove_coordinator() -> None:
+            self._coordinators.discard(coordinator)
+            if not self._coordinators:
+                self._cancel_cycles()
+
+        return remove_coordinator
+
+    def _cancel_cycles(self) -> None:
+        if self._cycle_task is not None:
+            self._cycle_task.cancel()
+            self._cycle_task = None
+
+    async def _async_run_cycles(self) -> None:
+        """Start the refreshes of the due meters together, once per tick.
+
+        Ticks fall on wall clock multiples of the GCD of the meters' poll
+        intervals, and a meter is due on multiples of its own interval: meters
+        with the same interval always read in the same cycle, and the loop
+        wakes once per tick instead of once per meter. Every refresh runs on
+        its own, so a slow meter only skips its own late ticks.
+        """
+        refreshes = {}  # coordinator -> its running refresh task
+        try:
+            while self._coordinators:
+                intervals = {
+                    coordinator: round(coordinator.poll_interval * 1000)
+                    for coordinator in self._coordinators
+                }
+                tick = math.gcd(*intervals.values())
+                now = round(time.time() * 1000)
+                next_tick = (now // tick + 1) * tick
+                await asyncio.sleep((next_tick - now) / 1000)
+                refreshes = {
+                    coordinator: task
+                    for coordinator, task in refreshes.items()
+                    if not task.done() and coordinator in self._coordinators
+                }
+                for coordinator, interval in intervals.items():
+                    if (
+                        next_tick % interval
+                        or coordinator in refreshes
+                        or coordinator not in self._coordinators
+                    ):
+                        continue  # Not due, or still running past its tick
+                    refreshes[coordinator] = self.hass.async_create_background_task(
+                        coordinator.async_refresh(),
+                        f"{DOMAIN} refresh slave {coordinator.slave_id}",
+                    )
+        finally:
+            for task in refreshes.values():
+                task.cancel()
+
+    def startup_delay(self) -> float:
+        """Return how long a new meter should wait before its first poll.
+
+        Meters set up together start STARTUP_STAGGER apart instead of all
+        queueing a full read on the bus at once.
+        """
+        now = time.monotonic()
+        self._next_startup = max(now, self._next_startup + STARTUP_STAGGER)
+        return self._next_startup - now
+
+    async def _async_pace(self) -> None:
+        """Keep the transport's required quiet time since the previous frame."""
+        wait = self._last_frame_end + self.frame_gap - time.monotonic()
+        if wait > 0:
+            await self._async_sleep(wait)
+
+    async def _async_sleep(self, delay: float) -> None:
+        self.metrics.sleep_time += delay
+        await asyncio.sleep(delay)
+
+    def _record_pacing(self, ok: bool) -> None:
+        """Adjust pacing from the outcome of a transaction (fixed by default)."""
 
+    @property
+    def connections(self) -> int:
+        """Connections in the pool, busy or idle."""
+        return len(self._pool)
+
+    @property
+    def offline_slaves(self) -> set:
+        return {
+            slave for slave, count in self._unanswered.items() if count >= OFFLINE_AFTER
+        }
+
+    def request_timeout(self, device_id: int) -> float:
+        """Return the response timeout for the next request to device_id."""
+        if self._unanswered.get(device_id, 0) >= OFFLINE_AFTER:
+            return self.offline_timeout
+        return min(
+            TIMEOUT_MAX, self.timeout * self._timeout_backoff.get(device_id, 1.0)
+        )
+
+    def _update_timeouts(self) -> None:
+        """Recompute the timeouts from the recent round trip times.
+
+        Answering slaves get TIMEOUT_FACTOR x p99, offline ones just p99:
+        enough to notice one coming back without stalling the bus each cycle.
+        """
+        latency = self.metrics.latency
+        if latency.count < TIMEOUT_MIN_SAMPLES or latency.count % TIMEOUT_UPDATE_EVERY:
+            return
+        p99 = latency.percentile(99)
+        self.timeout = min(TIMEOUT_MAX, max(TIMEOUT_MIN, TIMEOUT_FACTOR * p99))
+        self.offline_timeout = min(self.timeout, max(TIMEOUT_MIN, p99))
+
+    def _record_answer(self, device_id: int) -> None:
+        if self._unanswered.pop(device_id, 0) >= OFFLINE_AFTER:
+            _LOGGER.info("SDM630 slave %s answers again", device_id)
+        self._timeout_backoff.pop(device_id, None)
+
+    def _record_unanswered(self, device_id: int) -> None:
+        count = self._unanswered.get(device_id, 0) + 1
+        self._unanswered[device_id] = count
+        if count < OFFLINE_AFTER:
+            # A slower link rather than a missing slave? Give the next request longer
+            backoff = self._timeout_backoff.get(device_id, 1.0)
+            self._timeout_backoff[device_id] = min(
+                backoff * 2, TIMEOUT_MAX / self.timeout
+            )
+        elif count == OFFLINE_AFTER:
+            _LOGGER.info(
+                "SDM630 slave %s not answering, probing it with a %.2f s timeout",
+                device_id,
+                self.offline_timeout,
+            )
+
+    @staticmethod
+    def _apply_timeout(client, timeout: float) -> None:
+        """Set the response timeout of the client's next request."""
+        transaction = getattr(client, "ctx", None)  # Replay clients have none
+        if transaction is not None:
+            # pymodbus reads it from the transaction manager's copy of the parameters
+            transaction.comm_params.timeout_connect = timeout
+
+    async def async_read(
+        self,
+        address: int,
+        count: int,
+        device_id: int,
+        priority: int = PRIORITY_NORMAL,
+        deadline: float | None = None,
+    ):
+        """Read input registers through the bus arbiter.
+
+        Raises DeadlineExpired when the bus could not be granted before deadline.
+        Exception responses are returned as-is; the connection is only reopened
+        for transport errors, not because one register misbehaves.
+        """
+        queued = time.monotonic()
+        async with self.arbiter.transaction(priority, deadline):
+            self.metrics.bus_wait_time += time.monotonic() - queued
+            # The arbiter never grants more transactions than there are clients
+            client = self._idle.pop()
+            try:
+                return await self._async_transaction(client, address, count, device_id)
+            finally:
+                self._idle.append(client)
+
+    async def _async_transaction(
+        self, client, address: int, count: int, device_id: int
+    ):
+        if not await self._async_connect_client(client):
+            raise ConnectionException("Failed to connect to SDM630")
+        await self._async_pace()
+        metrics = self.metrics
+        metrics.requests += 1
+        metrics.bytes_sent += self.request_frame_bytes
+        # A slave that already missed replies is suspect itself, its errors say nothing about the link
+        suspect = device_id in self._unanswered
+        self._apply_timeout(client, self.request_timeout(device_id))
+        started = time.monotonic()
+        try:
+            result = await client.read_input_registers(
+                address=address, count=count, device_id=device_id
+            )
+        except ConnectionException:
+            metrics.failed_requests += 1
+            self._record_pacing(False)
+            await self._async_reset(client)
+            raise
+        except ModbusException as err:
+            metrics.failed_requests += 1
+            self._record_unanswered(device_id)
+            if suspect or _is_no_response(err):
+                # Silence is the slave's: only garbled or mismatched frames point at the link
+                raise
+            self._record_pacing(False)
+            self._protocol_errors += 1
+            if self._protocol_errors >= TRANSPORT_ERROR_THRESHOLD:
+                # Failing across several blocks points at the link, reconnect to
+                # clear transaction ID mismatches
+                self._protocol_errors = 0
+                await self._async_reset(client)
+            else:
+                # Let a late or partial response drain before the next frame
+                await self._async_sleep(self.reset_delay)
+            raise
+        finally:
+            self._last_frame_end = time.monotonic()
+        metrics.latency.record(self._last_frame_end - started)
+        self._update_timeouts()
+        self._record_answer(device_id)
+        if result.isError():
+            metrics.exception_responses += 1
+            metrics.bytes_received += self.response_overhead_bytes
+        else:
+            metrics.bytes_received += self.response_overhead_bytes + 2 * len(
+                result.registers
+            )
+        self._protocol_errors = 0
+        # Even an exception response means the frame got through, a short one did not
+        self._record_pacing(result.isError() or len(result.registers) == count)
+        return result
 
-class SDM630SerialHub:
+    @property
+    def register_cap(self) -> int:
+        """Lowest CONF_MAX_REGISTERS of the meters on this hub."""
+        return min(self._register_caps.values(), default=DEFAULT_MAX_REGISTERS)
+
+    def set_register_cap(self, entry_id: str, cap: int) -> None:
+        self._register_caps[entry_id] = cap
+        self._update_max_registers()
+
+    def remove_register_cap(self, entry_id: str) -> None:
+        self._register_caps.pop(entry_id, None)
+        self._update_max_registers()
+
+    def _update_max_registers(self) -> None:
+        self.max_registers = min(
+            self.register_cap, self.device_max_registers or DEFAULT_MAX_REGISTERS
+        )
+
+    def apply_profile(self, profile: dict) -> None:
+        """Apply a persisted capability profile."""
+        # What this hub learned since startup wins over what was persisted
+        self.profile = {**profile, **(self.profile or {})}
+        profile = self.profile
+        self.device_max_registers = profile.get(
+            "max_registers", self.device_max_registers
+        )
+        self._update_max_registers()
+        for client in self._pool[profile.get("max_connections", len(self._pool)) :]:
+            if client in self._idle and client is not self.client:
+                client.close()
+                self._pool.remove(client)
+                self._idle.remove(client)
+        self.arbiter.max_outstanding = len(self._pool)
+
+    @callback
+    def async_add_profile_listener(self, update_callback):
+        """Listen for capability profile changes, returns a remove function."""
+        self._profile_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._profile_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_update_profile(self, **changes) -> None:
+        """Merge changes into the profile, a None value removes the key."""
+        profile = {**(self.profile or {}), **changes}
+        self.profile = {
+            key: value for key, value in profile.items() if value is not None
+        }
+        for update_callback in list(self._profile_listeners):
+            update_callback(self.profile)
+
+    def _probe_due(self) -> bool:
+        ceiling = min(self._probe_window[1], self.register_cap)
+        if self.device_max_registers is None:
+            return self._probed_up_to < ceiling
+        # A fallback may have been caused by a bad moment, look upward again now and then
+        return (
+            self.device_max_registers < ceiling and time.monotonic() >= self._next_probe
+        )
+
+    async def async_ensure_profile(self, slave_id: int) -> None:
+        """Probe the largest reliable block size on first connect, and upward again later."""
+        if not self._probe_due():
+            return
+        async with self._probe_lock:
+            if not self._probe_due():
+                return  # Another meter on this hub probed while we waited
+
+            async def _read(address: int, count: int) -> list:
+                result = await self.async_read(address, count, slave_id)
+                if result.isError():
+                    raise ValueError(f"Read error: {result}")
+                return result.registers
+
+            address, count = self._probe_window
+            upper = min(count, self.register_cap)
+            size = await async_probe_max_registers(_read, address, upper=upper)
+            if size is None:
+                _LOGGER.debug(
+                    "Block size probe for slave %s got no response, retrying later",
+                    slave_id,
+                )
+                return
+            self._next_probe = time.monotonic() + PROFILE_REPROBE_INTERVAL
+            if size == upper and upper < count:
+                # Only the user cap was tested, the device limit is still unknown
+                self._probed_up_to = upper
+                self.device_max_registers = None
+                self._update_max_registers()
+                self._async_update_profile(max_registers=None)
+                return
+            _LOGGER.info("SDM630 hub reads up to %s registers per request", size)
+            self.device_max_registers = size
+            self._update_max_registers()
+            self._async_update_profile(max_registers=size)
+
+    @callback
+    def record_block_result(self, count: int, ok: bool) -> None:
+        """Track block size failures and shrink the block size if needed.
+
+        Only pass failures that point at the block size: short or truncated
+        responses, or timeouts while the slave still answers smaller reads.
+        """
+        if count <= REGISTERS_PER_VALUE or count < self.max_registers // 2:
+            return  # Small blocks say nothing about the block size
+        if ok:
+            self._size_failures = 0
+            return
+        self._size_failures += 1
+        if self._size_failures >= PROFILE_FALLBACK_ERRORS:
+            self._size_failures = 0
+            self.device_max_registers = max(REGISTERS_PER_VALUE, count // 2)
+            self._update_max_registers()
+            self._next_probe = time.monotonic() + PROFILE_REPROBE_INTERVAL
+            _LOGGER.warning(
+                "Repeated errors on large reads, limiting SDM630 hub to %s registers per request",
+                self.max_registers,
+            )
+            self._async_update_profile(max_registers=self.device_max_registers)
+
+
+class SDM630SerialHub(SDM630Hub):
     """Manages a single serial connection shared across meters."""
 
     def __init__(
@@ -144,31 +847,50 @@ class SDM630SerialHub:
         parity: str,
         stopbits: int,
         bytesize: int,
+        client=None,
     ):
-        self.hass = hass
+        """client replaces the serial client, e.g. with a replay.ReplayClient."""
+        super().__init__(hass)
         self.port = port
         self.baudrate = baudrate
         self.parity = parity
         self.stopbits = stopbits
         self.bytesize = bytesize
-        self.client = AsyncModbusSerialClient(
-            port=port,
-            baudrate=baudrate,
-            parity=parity,
-            stopbits=stopbits,
-            bytesize=bytesize,
-            timeout=5,
+        # Time on the wire for one character: start bit, data bits, parity, stop bits
+        char_time = (1 + bytesize + (0 if parity == "N" else 1) + stopbits) / baudrate
+        self.frame_gap = (
+            RTU_FAST_SILENT_INTERVAL
+            if baudrate > RTU_FAST_BAUDRATE
+            else 3.5 * char_time
+        )
+        # After an error let any partial response drain before the next frame
+        self.reset_delay = RTU_MAX_FRAME_BYTES * char_time + self.frame_gap
+        # RTU allows exactly one outstanding transaction on the wire
+        self._init_pool(
+            [
+                client
+                or AsyncModbusSerialClient(
+                    port=port,
+                    baudrate=baudrate,
+                    parity=parity,
+                    stopbits=stopbits,
+                    bytesize=bytesize,
+                    timeout=DEFAULT_REQUEST_TIMEOUT,
+                    retries=0,  # Retrying is up to the next cycle, a silent slave must not hold the bus
+                )
+            ]
         )
 
     async def close(self):
         """Close the connection safely."""
+        self._cancel_cycles()
         if self.client is not None:
             if self.client.connected:
                 try:
                     self.client.close()
                     _LOGGER.debug("Successfully closed SDM630 connection")
-                except Exception as err:
-                    _LOGGER.exception("Unexpected error closing SDM630 connection: %s", err)
+                except Exception:
+                    _LOGGER.exception("Unexpected error closing SDM630 connection")
             else:
                 _LOGGER.debug("SDM630 client was already disconnected")
             # Always nil out the client to prevent reuse
@@ -177,24 +899,79 @@ class SDM630SerialHub:
             _LOGGER.debug("SDM630 client was already None - nothing to close")
 
 
-class SDM630TcpHub:
-    """Manages a single TCP connection shared across meters."""
+class SDM630TcpHub(SDM630Hub):
+    """Manages a small pool of TCP connections to one gateway, shared across meters."""
 
-    def __init__(self, hass: HomeAssistant, host: str, port: int):
-        self.hass = hass
+    # MBAP header instead of slave address and CRC
+    request_frame_bytes = 12
+    response_overhead_bytes = 9
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host: str,
+        port: int,
+        connections: int = 1,
+        client_factory=None,
+    ):
+        """client_factory replaces the TCP client constructor, e.g. for replay.ReplayClient."""
+        super().__init__(hass)
         self.host = host
         self.port = port
-        self.client = AsyncModbusTcpClient(
-            host=host,
-            port=port,
-            timeout=5,
+        self._client_factory = client_factory
+        # Most gateways need no settling time, learn it from errors instead
+        self.reset_delay = TCP_MIN_RESET_DELAY
+        self._gap_successes = 0
+        self._init_pool([self._new_client() for _ in range(connections)])
+
+    def _new_client(self) -> AsyncModbusTcpClient:
+        if self._client_factory is not None:
+            return self._client_factory()
+        return AsyncModbusTcpClient(
+            host=self.host,
+            port=self.port,
+            timeout=DEFAULT_REQUEST_TIMEOUT,
+            retries=0,  # Retrying is up to the next cycle, a silent slave must not hold the bus
         )
 
+    def grow_pool(self, connections: int) -> None:
+        """Open up to this many connections, unless the gateway is known to refuse them."""
+        limit = (self.profile or {}).get("max_connections", connections)
+        while len(self._pool) < min(connections, limit):
+            client = self._new_client()
+            self._pool.append(client)
+            self._idle.append(client)
+        self.arbiter.max_outstanding = len(self._pool)
+
+    def _record_pacing(self, ok: bool) -> None:
+        """Widen the gap after failures, shrink it again after a run of good frames."""
+        if not ok:
+            self._gap_successes = 0
+            self.frame_gap = min(max(self.frame_gap * 2, TCP_GAP_STEP), TCP_MAX_GAP)
+            self.reset_delay = max(TCP_MIN_RESET_DELAY, 4 * self.frame_gap)
+            _LOGGER.debug(
+                "Gateway %s:%s settling gap now %.3f s",
+                self.host,
+                self.port,
+                self.frame_gap,
+            )
+            return
+        self._gap_successes += 1
+        if self.frame_gap and self._gap_successes >= TCP_GAP_DECAY_AFTER:
+            self._gap_successes = 0
+            self.frame_gap = (
+                self.frame_gap / 2 if self.frame_gap > TCP_GAP_STEP else 0.0
+            )
+            self.reset_delay = max(TCP_MIN_RESET_DELAY, 4 * self.frame_gap)
+
     async def close(self):
-        """Close the connection safely."""
-        if self.client is not None:
-            if self.client.connected:
+        """Close the connections safely."""
+        self._cancel_cycles()
+        for client in self._pool:
+            if client.connected:
                 try:
-                    self.client.close()
-                except Exception as err:
-                    _LOGGER.exception("Unexpected error closing SDM630 connection for tcp: %s", err)
+                    client.close()
+                except Exception:
+                    _LOGGER.exception(
+                        "Unexpected error closing SDM630 connection for tcp"
+                    )
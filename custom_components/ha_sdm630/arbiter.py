@@ -0,0 +1,122 @@
+"""Request arbitration for meters sharing one Modbus bus."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+
+# Lower value wins
+PRIORITY_URGENT = 0  # fast tier, e.g. total power for load control
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2  # slow tier: energy counters, THD, demand
+
+# Grants in a row that overtake waiting lower priority requests before the
+# oldest of those gets its turn, so urgent streams can't starve polling
+MAX_PRIORITY_STREAK = 8
+
+
+class DeadlineExpired(Exception):
+    """The request could not be started before its deadline."""
+
+
+class BusArbiter:
+    """Grant bus transactions one at a time, highest priority first.
+
+    Waiters are ordered by priority, then earliest deadline, then arrival.
+    A waiter whose deadline passes before it gets the bus is failed with
+    DeadlineExpired instead of running late. Transactions in flight are never
+    interrupted, so urgent requests preempt queued bulk requests only. After
+    max_streak grants in a row that overtook lower priority waiters, the
+    oldest of those goes next.
+    """
+
+    def __init__(
+        self, max_outstanding: int = 1, max_streak: int = MAX_PRIORITY_STREAK
+    ) -> None:
+        self.max_outstanding = max_outstanding
+        self.max_streak = max_streak
+        self._active = 0
+        self._waiters = []  # heap of (priority, deadline, seq, future)
+        self._seq = itertools.count()
+        self._streak = 0  # grants in a row that overtook a lower priority waiter
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for the bus."""
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    @asynccontextmanager
+    async def transaction(
+        self, priority: int = PRIORITY_NORMAL, deadline: float | None = None
+    ):
+        """Hold the bus for one transaction. deadline is a time.monotonic() value."""
+        await self._acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int, deadline: float | None) -> None:
+        if self._active < self.max_outstanding and not self._waiters:
+            self._active += 1
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExpired
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (
+                priority,
+                deadline if deadline is not None else float("inf"),
+                next(self._seq),
+                fut,
+            ),
+        )
+        self._grant()  # The bus may be free with only cancelled waiters queued
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                # The bus was handed to us just as we got cancelled, pass it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        now = time.monotonic()
+        while self._waiters and self._active < self.max_outstanding:
+            priority, deadline, _seq, fut = self._pop_waiter()
+            if fut.done():
+                continue  # Cancelled while waiting
+            if now >= deadline:
+                fut.set_exception(DeadlineExpired())
+                continue
+            self._active += 1
+            overtaken = any(
+                waiter[0] > priority and not waiter[3].done()
+                for waiter in self._waiters
+            )
+            self._streak = self._streak + 1 if overtaken else 0
+            fut.set_result(None)
+
+    def _pop_waiter(self) -> tuple:
+        """Pop the most urgent waiter, or the oldest lower priority one once the streak is up."""
+        if self._streak >= self.max_streak:
+            top = self._waiters[0][0]
+            starved = [
+                waiter
+                for waiter in self._waiters
+                if waiter[0] > top and not waiter[3].done()
+            ]
+            if starved:
+                waiter = min(starved, key=lambda waiter: waiter[2])
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._streak = 0
+                return waiter
+        return heapq.heappop(self._waiters)
@@ -0,0 +1,84 @@
+"""Per-block circuit breaker for failing register reads."""
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consecutive failures before a block is quarantined
+BREAKER_THRESHOLD = 3
+# First quarantine period in seconds, doubled after every failed probe
+BREAKER_BASE_BACKOFF = 30.0
+BREAKER_MAX_BACKOFF = 1800.0
+
+
+class BlockBreaker:
+    """Track failures per read block and quarantine blocks that keep failing.
+
+    Only failures of the block itself belong here (exception responses, or
+    no answer while the slave answers other reads), not an unreachable slave.
+
+    A quarantined (open) block is skipped until its backoff expires. The next
+    read is then a probe: success closes the breaker, failure reopens it with
+    twice the backoff, up to max_backoff.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        base_backoff: float = BREAKER_BASE_BACKOFF,
+        max_backoff: float = BREAKER_MAX_BACKOFF,
+    ) -> None:
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._failures = {}  # block key -> consecutive failures
+        self._open_until = {}  # block key -> monotonic time the next probe is allowed
+        self._backoff = {}  # block key -> current backoff
+
+    @property
+    def quarantined(self) -> list:
+        """Keys of blocks that are currently open."""
+        return list(self._open_until)
+
+    def failing(self, key) -> bool:
+        """Return True if the last read of the block failed."""
+        return key in self._failures
+
+    def allow(self, key, now: float) -> bool:
+        """Return True if the block may be read (closed, or due for a probe)."""
+        open_until = self._open_until.get(key)
+        return open_until is None or now >= open_until
+
+    def record_success(self, key) -> None:
+        if key in self._open_until:
+            _LOGGER.info("Block %s answers again, resuming normal polling", key)
+        self._failures.pop(key, None)
+        self._open_until.pop(key, None)
+        self._backoff.pop(key, None)
+
+    def reset(self) -> None:
+        """Close every block, e.g. when a slave that went silent answers again."""
+        if self._open_until:
+            _LOGGER.info("Resuming %s quarantined block(s)", len(self._open_until))
+        self._failures.clear()
+        self._open_until.clear()
+        self._backoff.clear()
+
+    def record_failure(self, key, now: float) -> None:
+        failures = self._failures.get(key, 0) + 1
+        self._failures[key] = failures
+        if key in self._open_until:
+            # Probe failed, back off further
+            backoff = min(self._backoff[key] * 2, self.max_backoff)
+        elif failures >= self.threshold:
+            backoff = self.base_backoff
+            _LOGGER.warning(
+                "Block %s failed %s times in a row, skipping it for %.0f s",
+                key,
+                failures,
+                backoff,
+            )
+        else:
+            return
+        self._backoff[key] = backoff
+        self._open_until[key] = now + backoff
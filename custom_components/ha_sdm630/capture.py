@@ -0,0 +1,238 @@
+"""Append-only binary capture of raw register reads, with a memory-mapped reader.
+
+File layout: the 8 byte magic, then one record per read request:
+
+    header  <dfBBBBHHH  (22 bytes)
+            time        wall clock time of the request (float64, epoch seconds)
+            duration    request latency in seconds (float32)
+            slave       Modbus slave ID
+            status      STATUS_* below
+            exception   Modbus exception code for STATUS_EXCEPTION, else 0
+            reserved    0
+            start       first register address
+            count       registers requested
+            received    registers in the payload
+    payload received * 2 bytes, little-endian register words
+
+Files rotate when they reach max_bytes, keeping `backups` older files as
+<path>.1, <path>.2, ... Summarize a capture with:
+
+    python capture.py <file> [<file> ...]
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+MAGIC = b"SDMCAP1\0"
+RECORD_HEADER = struct.Struct("<dfBBBBHHH")
+
+STATUS_OK = 0
+STATUS_SHORT = 1  # fewer registers than requested
+STATUS_EXCEPTION = 2  # Modbus exception response
+STATUS_ERROR = 3  # no valid response: timeout, transport or framing error
+STATUS_NAMES = {
+    STATUS_OK: "ok",
+    STATUS_SHORT: "short",
+    STATUS_EXCEPTION: "exception",
+    STATUS_ERROR: "error",
+}
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def pack_record(
+    timestamp: float,
+    duration: float,
+    slave: int,
+    status: int,
+    start: int,
+    count: int,
+    registers=(),
+    exception_code: int = 0,
+) -> bytes:
+    """Return one encoded record."""
+    header = RECORD_HEADER.pack(
+        timestamp,
+        duration,
+        slave,
+        status,
+        exception_code,
+        0,
+        start,
+        count,
+        len(registers),
+    )
+    return header + struct.pack(f"<{len(registers)}H", *registers)
+
+
+class CaptureWriter:
+    """Append records to a size bounded, rotating capture file.
+
+    write() does blocking file I/O, call it from an executor.
+    """
+
+    def __init__(self, path, max_bytes: int, backups: int = 2) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def write(self, data: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+            size = 0
+        with self.path.open("ab") as file:
+            if not size:
+                file.write(MAGIC)
+            file.write(data)
+
+    def _rotate(self) -> None:
+        for index in range(self.backups, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            newer = (
+                self.path.with_name(f"{self.path.name}.{index - 1}")
+                if index > 1
+                else self.path
+            )
+            if newer.exists():
+                os.replace(newer, older)
+        if not self.backups:
+            self.path.unlink(missing_ok=True)
+
+
+class CaptureRecord(NamedTuple):
+    time: float
+    duration: float
+    slave: int
+    status: int
+    exception_code: int
+    start: int
+    count: int
+    registers: object  # sequence of register words, a zero-copy view where possible
+
+
+class CaptureReader:
+    """Memory-mapped, sequential reader of a capture file.
+
+    Iterating yields CaptureRecords; on little-endian hosts the register
+    payloads are memoryview slices of the map, so scanning copies nothing.
+    Use as a context manager, views must not be used after close().
+    """
+
+    def __init__(self, path) -> None:
+        self._file = open(path, "rb")  # noqa: SIM115 - open until close(), see __exit__
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._map = b""
+        if self._map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an SDM630 capture file")
+        self._view = memoryview(self._map)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._view = None
+        if isinstance(self._map, mmap.mmap):
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Record views still alive, the map closes when they are gone
+        self._file.close()
+
+    def iter_headers(self):
+        """Yield (time, duration, slave, status, exception_code, start, count, received)
+        per record without touching the payloads, the fastest way to scan a file."""
+        view = self._view
+        unpack_from = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+        pos = len(MAGIC)
+        end = len(view)
+        while pos + header_size <= end:
+            header = unpack_from(view, pos)
+            pos += header_size + 2 * header[-1]
+            if pos > end:
+                break  # Torn write at the end of the file
+            yield header[:5] + header[6:]
+
+    def __iter__(self):
+        view = self._view
+        unpack_from = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+        pos = len(MAGIC)
+        end = len(view)
+        while pos + header_size <= end:
+            (
+                timestamp,
+                duration,
+                slave,
+                status,
+                exception_code,
+                _reserved,
+                start,
+                count,
+                received,
+            ) = unpack_from(view, pos)
+            pos += header_size
+            payload = view[pos : pos + 2 * received]
+            if len(payload) < 2 * received:
+                break  # Torn write at the end of the file
+            pos += 2 * received
+            if _LITTLE_ENDIAN:
+                registers = payload.cast("H")
+            else:
+                registers = array("H", payload)
+                registers.byteswap()
+            yield CaptureRecord(
+                timestamp,
+                duration,
+                slave,
+                status,
+                exception_code,
+                start,
+                count,
+                registers,
+            )
+
+
+def summarize(path) -> dict:
+    """Return record counts, status counts, time span and latency of a capture file."""
+    statuses = Counter()
+    records = 0
+    first = last = None
+    latency = 0.0
+    with CaptureReader(path) as reader:
+        for timestamp, duration, _slave, status, *_rest in reader.iter_headers():
+            records += 1
+            statuses[STATUS_NAMES.get(status, status)] += 1
+            latency += duration
+            first = timestamp if first is None else first
+            last = timestamp
+    return {
+        "file": str(path),
+        "records": records,
+        "statuses": dict(statuses),
+        "first": first,
+        "last": last,
+        "mean_latency": latency / records if records else None,
+    }
+
+
+if __name__ == "__main__":
+    for capture_path in sys.argv[1:]:
+        print(summarize(capture_path))
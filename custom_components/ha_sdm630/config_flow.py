@@ -1,47 +1,107 @@
 """Config flow for SDM630 integration."""
 
 import logging
+from itertools import product
 from typing import Any
 
-import serial.tools.list_ports
 import voluptuous as vol
-from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
-from pymodbus.exceptions import ModbusException
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
-from homeassistant.core import callback
+from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusException
 
 from .const import (
     CONF_BAUDRATE,
     CONF_BYTESIZE,
+    CONF_CAPTURE,
+    CONF_CAPTURE_MAX_SIZE,
     CONF_CONNECTION_TYPE,
+    CONF_DEADBAND_SCALE,
+    CONF_FAST_INTERVAL,
     CONF_HOST,
+    CONF_MAX_REGISTERS,
+    CONF_MAX_STATE_AGE,
+    CONF_MEDIUM_INTERVAL,
     CONF_PARITY,
     CONF_PORT,
+    CONF_REGISTER_SET,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLED_REGISTERS,
+    CONF_SCAN_BAUDRATES,
+    CONF_SCAN_EXPECTED,
+    CONF_SCAN_FIRST_SLAVE,
+    CONF_SCAN_LAST_SLAVE,
+    CONF_SCAN_PARITIES,
+    CONF_SCAN_SLAVES,
     CONF_SERIAL_PORT,
     CONF_SLAVE_ID,
+    CONF_SLOW_INTERVAL,
+    CONF_STALE_AFTER,
     CONF_STOPBITS,
+    CONF_TCP_CONNECTIONS,
     CONNECTION_TYPE_SERIAL,
     CONNECTION_TYPE_TCP,
     DEFAULT_BAUDRATE,
     DEFAULT_BYTESIZE,
+    DEFAULT_CAPTURE,
+    DEFAULT_CAPTURE_MAX_SIZE,
+    DEFAULT_DEADBAND_SCALE,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_MAX_REGISTERS,
+    DEFAULT_MAX_STATE_AGE,
+    DEFAULT_MEDIUM_INTERVAL,
     DEFAULT_PARITY,
+    DEFAULT_REGISTER_SET,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SAMPLED_REGISTERS,
     DEFAULT_SLAVE_ID,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_STALE_AFTER,
     DEFAULT_STOPBITS,
+    DEFAULT_TCP_CONNECTIONS,
     DEFAULT_TCP_PORT,
-    CONF_REGISTER_SET,
-    DEFAULT_REGISTER_SET,
+    DOMAIN,
+    MAX_TCP_CONNECTIONS,
     REGISTER_SET_BASIC,
     REGISTER_SET_BASIC_PLUS,
     REGISTER_SET_FULL,
-    DOMAIN,
+    REGISTER_SETS,
+)
+from .scanner import (
+    SCAN_TCP_INITIAL_TIMEOUT,
+    SCAN_TCP_LANES,
+    BusScanner,
+    async_scan_serial,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Connection type choices that scan the bus instead of adding one meter
+SCAN_SERIAL = "scan_serial"
+SCAN_TCP = "scan_tcp"
+
+BAUDRATES = [2400, 4800, 9600, 19200, 38400]
+PARITIES = ["N", "E", "O"]
+
+
+def _list_serial_ports() -> list:
+    """List serial ports, importing pyserial's port scanner only when the serial step needs it."""
+    import serial.tools.list_ports
+
+    return serial.tools.list_ports.comports()
+
+
+def _meter_key(data) -> tuple:
+    """Identify a meter by its bus and slave ID, to skip meters already configured."""
+    if data.get(CONF_CONNECTION_TYPE, CONNECTION_TYPE_SERIAL) == CONNECTION_TYPE_SERIAL:
+        return (data.get(CONF_SERIAL_PORT), data.get(CONF_SLAVE_ID))
+    return (data.get(CONF_HOST), data.get(CONF_PORT), data.get(CONF_SLAVE_ID))
+
 
 class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SDM630."""
@@ -51,29 +111,48 @@ class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize the config flow."""
         self._connection_type = None
+        self._scan_data = {}  # connection settings shared by the meters a scan found
+        self._scan_found = {}  # slave ID -> response time
 
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry):
         """Get the options flow for this handler."""
         return SDM630OptionsFlowHandler(config_entry)
-        
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Handle connection type selection."""
         if user_input is not None:
             self._connection_type = user_input[CONF_CONNECTION_TYPE]
             if self._connection_type == CONNECTION_TYPE_SERIAL:
                 return await self.async_step_serial()
-            else:
-                return await self.async_step_tcp()
+            if self._connection_type == SCAN_SERIAL:
+                return await self.async_step_scan_serial()
+            if self._connection_type == SCAN_TCP:
+                return await self.async_step_scan_tcp()
+            return await self.async_step_tcp()
 
         data_schema = vol.Schema(
             {
-                vol.Required(CONF_CONNECTION_TYPE, default=CONNECTION_TYPE_SERIAL): selector.SelectSelector(
+                vol.Required(
+                    CONF_CONNECTION_TYPE, default=CONNECTION_TYPE_SERIAL
+                ): selector.SelectSelector(
                     selector.SelectSelectorConfig(
                         options=[
-                            selector.SelectOptionDict(value=CONNECTION_TYPE_SERIAL, label="Serial (RS485)"),
-                            selector.SelectOptionDict(value=CONNECTION_TYPE_TCP, label="TCP/IP (Modbus TCP)"),
+                            selector.SelectOptionDict(
+                                value=CONNECTION_TYPE_SERIAL, label="Serial (RS485)"
+                            ),
+                            selector.SelectOptionDict(
+                                value=CONNECTION_TYPE_TCP, label="TCP/IP (Modbus TCP)"
+                            ),
+                            selector.SelectOptionDict(
+                                value=SCAN_SERIAL,
+                                label="Serial (RS485) - scan the bus for meters",
+                            ),
+                            selector.SelectOptionDict(
+                                value=SCAN_TCP,
+                                label="TCP/IP - scan the gateway for meters",
+                            ),
                         ],
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
@@ -87,21 +166,7 @@ class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle serial connection configuration."""
         errors = {}
 
-        # Discover serial ports every time (in case plugged/unplugged)
-        ports = await self.hass.async_add_executor_job(serial.tools.list_ports.comports)
-
-        port_options = [
-            selector.SelectOptionDict(
-                value=port.device,
-                label=(
-                    f"{port.device} - {port.description or 'Unknown device'}"
-                    + (f" ({port.manufacturer})" if port.manufacturer else "")
-                ),
-            )
-            for port in ports
-            if port.device
-        ]
-        port_options.sort(key=lambda x: x["value"])
+        port_options = await self._async_port_options()
 
         data_schema = vol.Schema(
             {
@@ -116,17 +181,11 @@ class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Coerce(int), vol.Range(min=1, max=247)
                 ),
                 vol.Required(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): vol.In(
-                    [2400, 4800, 9600, 19200, 38400]
-                ),
-                vol.Required(CONF_PARITY, default=DEFAULT_PARITY): vol.In(
-                    ["N", "E", "O"]
-                ),
-                vol.Required(CONF_STOPBITS, default=DEFAULT_STOPBITS): vol.In(
-                    [1, 2]
-                ),
-                vol.Required(CONF_BYTESIZE, default=DEFAULT_BYTESIZE): vol.In(
-                    [7, 8]
+                    BAUDRATES
                 ),
+                vol.Required(CONF_PARITY, default=DEFAULT_PARITY): vol.In(PARITIES),
+                vol.Required(CONF_STOPBITS, default=DEFAULT_STOPBITS): vol.In([1, 2]),
+                vol.Required(CONF_BYTESIZE, default=DEFAULT_BYTESIZE): vol.In([7, 8]),
             }
         )
 
@@ -154,9 +213,9 @@ class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "read_error"
             except ValueError:
                 errors["base"] = "read_error"
-            except Exception as err:
+            except Exception:
                 errors["base"] = "unknown"
-                _LOGGER.exception("Unexpected error during SDM630 serial setup: %s", err)
+                _LOGGER.exception("Unexpected error during SDM630 serial setup")
 
         return self.async_show_form(step_id="serial",data_schema=data_schema,errors=errors)
 
@@ -198,12 +257,262 @@ class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "read_error"
             except ValueError:
                 errors["base"] = "read_error"
-            except Exception as err:
+            except Exception:
                 errors["base"] = "unknown"
-                _LOGGER.exception("Unexpected error during SDM630 TCP setup: %s", err)
+                _LOGGER.exception("Unexpected error during SDM630 TCP setup")
 
         return self.async_show_form(step_id="tcp", data_schema=data_schema, errors=errors)
 
+    async def async_step_scan_serial(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan a serial bus for meters, trying several baudrate/parity settings."""
+        errors = {}
+
+        if user_input is not None:
+            settings = list(
+                product(
+                    map(int, user_input[CONF_SCAN_BAUDRATES]),
+                    user_input[CONF_SCAN_PARITIES],
+                )
+            )
+
+            def _make_client(
+                baudrate: int, parity: str, timeout: float
+            ) -> AsyncModbusSerialClient:
+                return AsyncModbusSerialClient(
+                    port=user_input[CONF_SERIAL_PORT],
+                    baudrate=baudrate,
+                    parity=parity,
+                    stopbits=user_input[CONF_STOPBITS],
+                    bytesize=user_input[CONF_BYTESIZE],
+                    timeout=timeout,
+                    retries=0,
+                )
+
+            try:
+                setting, found = await async_scan_serial(
+                    _make_client,
+                    settings,
+                    self._scan_range(user_input),
+                    user_input[CONF_SCAN_EXPECTED],
+                )
+            except ConnectionError:
+                errors["base"] = "cannot_connect"
+            except Exception:
+                errors["base"] = "unknown"
+                _LOGGER.exception("Unexpected error during SDM630 bus scan")
+            else:
+                if found:
+                    self._scan_data = {
+                        CONF_CONNECTION_TYPE: CONNECTION_TYPE_SERIAL,
+                        CONF_NAME: user_input[CONF_NAME],
+                        CONF_SERIAL_PORT: user_input[CONF_SERIAL_PORT],
+                        CONF_BAUDRATE: setting[0],
+                        CONF_PARITY: setting[1],
+                        CONF_STOPBITS: user_input[CONF_STOPBITS],
+                        CONF_BYTESIZE: user_input[CONF_BYTESIZE],
+                    }
+                    self._scan_found = found
+                    return await self.async_step_scan_results()
+                errors["base"] = "no_meters_found"
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME, default="SDM630"): str,
+                vol.Required(CONF_SERIAL_PORT): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=await self._async_port_options(),
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                # Every combination is tried in turn until one finds meters
+                vol.Required(
+                    CONF_SCAN_BAUDRATES, default=[str(DEFAULT_BAUDRATE)]
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[str(rate) for rate in BAUDRATES], multiple=True
+                    )
+                ),
+                vol.Required(
+                    CONF_SCAN_PARITIES, default=[DEFAULT_PARITY]
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=PARITIES, multiple=True)
+                ),
+                vol.Required(CONF_STOPBITS, default=DEFAULT_STOPBITS): vol.In([1, 2]),
+                vol.Required(CONF_BYTESIZE, default=DEFAULT_BYTESIZE): vol.In([7, 8]),
+                **self._scan_range_schema(),
+            }
+        )
+        return self.async_show_form(
+            step_id="scan_serial", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_scan_tcp(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan a Modbus TCP gateway for meters, over several connections at once."""
+        errors = {}
+
+        if user_input is not None:
+            scanner = BusScanner(
+                [
+                    AsyncModbusTcpClient(
+                        host=user_input[CONF_HOST],
+                        port=user_input[CONF_PORT],
+                        timeout=SCAN_TCP_INITIAL_TIMEOUT,
+                        retries=0,
+                    )
+                    for _ in range(SCAN_TCP_LANES)
+                ],
+                SCAN_TCP_INITIAL_TIMEOUT,
+            )
+            try:
+                found = await scanner.async_scan(
+                    self._scan_range(user_input), user_input[CONF_SCAN_EXPECTED]
+                )
+            except ConnectionError:
+                errors["base"] = "cannot_connect"
+            except Exception:
+                errors["base"] = "unknown"
+                _LOGGER.exception("Unexpected error during SDM630 gateway scan")
+            else:
+                if found:
+                    self._scan_data = {
+                        CONF_CONNECTION_TYPE: CONNECTION_TYPE_TCP,
+                        CONF_NAME: user_input[CONF_NAME],
+                        CONF_HOST: user_input[CONF_HOST],
+                        CONF_PORT: user_input[CONF_PORT],
+                    }
+                    self._scan_found = found
+                    return await self.async_step_scan_results()
+                errors["base"] = "no_meters_found"
+            finally:
+                await scanner.async_close()
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME, default="SDM630"): str,
+                vol.Required(CONF_HOST): str,
+                vol.Required(CONF_PORT, default=DEFAULT_TCP_PORT): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=65535)
+                ),
+                **self._scan_range_schema(),
+            }
+        )
+        return self.async_show_form(
+            step_id="scan_tcp", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_scan_results(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick the found meters to add, one entry each."""
+        configured = {_meter_key(entry.data) for entry in self._async_current_entries()}
+        new = {
+            slave_id: elapsed
+            for slave_id, elapsed in self._scan_found.items()
+            if _meter_key({**self._scan_data, CONF_SLAVE_ID: slave_id})
+            not in configured
+        }
+        if not new:
+            return self.async_abort(reason="already_configured")
+
+        if user_input is not None:
+            selected = sorted(
+                int(slave_id) for slave_id in user_input[CONF_SCAN_SLAVES]
+            )
+            if not selected:
+                return self.async_abort(reason="no_meters_selected")
+            entries = [
+                {
+                    **self._scan_data,
+                    CONF_NAME: f"{self._scan_data[CONF_NAME]} {slave_id}",
+                    CONF_SLAVE_ID: slave_id,
+                }
+                for slave_id in selected
+            ]
+            # This flow creates the first entry, the others go through the import step
+            for data in entries[1:]:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_IMPORT},
+                        data=data,
+                    )
+                )
+            return self.async_create_entry(title=entries[0][CONF_NAME], data=entries[0])
+
+        options = [
+            selector.SelectOptionDict(
+                value=str(slave_id), label=f"Slave {slave_id} ({elapsed * 1000:.0f} ms)"
+            )
+            for slave_id, elapsed in new.items()
+        ]
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_SCAN_SLAVES, default=[option["value"] for option in options]
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=options, multiple=True)
+                ),
+            }
+        )
+        return self.async_show_form(
+            step_id="scan_results",
+            data_schema=data_schema,
+            description_placeholders={"found": str(len(self._scan_found))},
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a meter found by a bus scan."""
+        if any(
+            _meter_key(entry.data) == _meter_key(import_data)
+            for entry in self._async_current_entries()
+        ):
+            return self.async_abort(reason="already_configured")
+        return self.async_create_entry(title=import_data[CONF_NAME], data=import_data)
+
+    async def _async_port_options(self) -> list:
+        """Return the serial ports as select options."""
+        # Discover serial ports every time (in case plugged/unplugged)
+        ports = await self.hass.async_add_executor_job(_list_serial_ports)
+
+        port_options = [
+            selector.SelectOptionDict(
+                value=port.device,
+                label=(
+                    f"{port.device} - {port.description or 'Unknown device'}"
+                    + (f" ({port.manufacturer})" if port.manufacturer else "")
+                ),
+            )
+            for port in ports
+            if port.device
+        ]
+        port_options.sort(key=lambda x: x["value"])
+        return port_options
+
+    @staticmethod
+    def _scan_range_schema() -> dict:
+        return {
+            vol.Required(CONF_SCAN_FIRST_SLAVE, default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=247)
+            ),
+            vol.Required(CONF_SCAN_LAST_SLAVE, default=247): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=247)
+            ),
+            # Stop as soon as this many meters answered, 0 scans the whole range
+            vol.Required(CONF_SCAN_EXPECTED, default=0): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=247)
+            ),
+        }
+
+    @staticmethod
+    def _scan_range(user_input: dict) -> range:
+        return range(
+            user_input[CONF_SCAN_FIRST_SLAVE], user_input[CONF_SCAN_LAST_SLAVE] + 1
+        )
+
     async def _async_test_serial_connection(self, data: dict[str, Any]) -> None:
         """Test serial connection to the SDM630 meter."""
         client = None
@@ -214,28 +523,28 @@ class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 parity=data.get(CONF_PARITY, DEFAULT_PARITY),
                 stopbits=data.get(CONF_STOPBITS, DEFAULT_STOPBITS),
                 bytesize=data.get(CONF_BYTESIZE, DEFAULT_BYTESIZE),
-                timeout=5,
+                timeout=DEFAULT_REQUEST_TIMEOUT,
             )
-            
+
             await client.connect()
             if not client.connected:
                 raise ConnectionError("Failed to open serial port")
-    
+
             result = await client.read_input_registers(
                 address=0, count=2, device_id=data[CONF_SLAVE_ID]
             )
-            
+
             if result.isError():
                 raise ModbusException(f"Modbus read error: {result}")
-                
+
             if len(result.registers) != 2:
                 raise ValueError("Invalid response: expected 2 registers")
-    
+
         finally:
             if client is not None:
                 try:
                     client.close()
-                except Exception as err:
+                except Exception as err:  # noqa: BLE001 - only closing a test client
                     _LOGGER.debug("Error closing Modbus Serial client: %s", err)
 
     async def _async_test_tcp_connection(self, data: dict[str, Any]) -> None:
@@ -245,30 +554,30 @@ class HA_SDM630ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             client = AsyncModbusTcpClient(
                 host=data[CONF_HOST],
                 port=data[CONF_PORT],
-                timeout=5,
+                timeout=DEFAULT_REQUEST_TIMEOUT,
             )
-    
+
             await client.connect()
             if not client.connected:
                 raise ConnectionError(f"Failed to connect to {data[CONF_HOST]}:{data[CONF_PORT]}")
-    
+
             result = await client.read_input_registers(
                 address=0, count=2, device_id=data[CONF_SLAVE_ID]  # ← Use 'device_id' not 'slave'
             )
-    
+
             if result.isError():
                 raise ModbusException(f"Modbus read error: {result}")
-    
+
             if len(result.registers) != 2:
                 raise ValueError("Invalid response: expected 2 registers")
-    
+
         finally:
             if client is not None:
                 try:
                     client.close()
-                except Exception as err:
+                except Exception as err:  # noqa: BLE001 - only closing a test client
                     _LOGGER.debug("Error closing Modbus TCP client: %s", err)
-                    
+
 class SDM630OptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: ConfigEntry):
         """Initialize options flow."""
@@ -286,6 +595,42 @@ class SDM630OptionsFlowHandler(config_entries.OptionsFlow):
         current_interval = self.config_entry.options.get(
             "update_interval", 10  # your default value in seconds
         )
+        current_max_registers = self.config_entry.options.get(
+            CONF_MAX_REGISTERS, DEFAULT_MAX_REGISTERS
+        )
+        current_medium_interval = self.config_entry.options.get(
+            CONF_MEDIUM_INTERVAL, DEFAULT_MEDIUM_INTERVAL
+        )
+        current_slow_interval = self.config_entry.options.get(
+            CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL
+        )
+        current_deadband_scale = self.config_entry.options.get(
+            CONF_DEADBAND_SCALE, DEFAULT_DEADBAND_SCALE
+        )
+        current_max_state_age = self.config_entry.options.get(
+            CONF_MAX_STATE_AGE, DEFAULT_MAX_STATE_AGE
+        )
+        current_stale_after = self.config_entry.options.get(
+            CONF_STALE_AFTER, DEFAULT_STALE_AFTER
+        )
+        current_sample_interval = self.config_entry.options.get(
+            CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+        )
+        # Only registers that are read (not derived) can be sampled
+        sample_options = [
+            selector.SelectOptionDict(value=key, label=info["name"])
+            for key, info in REGISTER_SETS.get(
+                current_register_set, REGISTER_SETS[REGISTER_SET_BASIC]
+            ).items()
+            if "derived" not in info
+        ]
+        current_sampled_registers = [
+            key
+            for key in self.config_entry.options.get(
+                CONF_SAMPLED_REGISTERS, DEFAULT_SAMPLED_REGISTERS
+            )
+            if any(option["value"] == key for option in sample_options)
+        ]
 
         data_schema = vol.Schema(
             {
@@ -316,9 +661,123 @@ class SDM630OptionsFlowHandler(config_entries.OptionsFlow):
                     default=current_interval,
                 ): vol.All(
                     vol.Coerce(int),
-                    vol.Range(min=5, max=300),  # 5 seconds to 5 minutes
+                    vol.Range(
+                        min=1, max=300
+                    ),  # 1 second to 5 minutes, used for power and current
+                ),
+                vol.Required(
+                    CONF_MEDIUM_INTERVAL,
+                    default=current_medium_interval,
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=1, max=3600),  # voltages, frequency, power factor
+                ),
+                vol.Required(
+                    CONF_SLOW_INTERVAL,
+                    default=current_slow_interval,
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=1, max=3600),  # energy counters, THD, demand
+                ),
+                vol.Required(
+                    CONF_DEADBAND_SCALE,
+                    default=current_deadband_scale,
+                ): vol.All(
+                    vol.Coerce(float),
+                    vol.Range(
+                        min=0, max=10
+                    ),  # 0 only skips unchanged values, higher writes less often
+                ),
+                vol.Required(
+                    CONF_MAX_STATE_AGE,
+                    default=current_max_state_age,
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(
+                        min=10, max=3600
+                    ),  # write state at least this often (seconds)
+                ),
+                vol.Required(
+                    CONF_STALE_AFTER,
+                    default=current_stale_after,
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(
+                        min=0, max=3600
+                    ),  # keep last value this long when reads fail (seconds)
+                ),
+                vol.Required(
+                    CONF_SAMPLE_INTERVAL,
+                    default=current_sample_interval,
+                ): vol.All(
+                    vol.Coerce(float),
+                    vol.Range(
+                        min=0, max=60
+                    ),  # seconds between samples, 0 disables high-rate sampling
+                ),
+                vol.Optional(
+                    CONF_SAMPLED_REGISTERS,
+                    default=current_sampled_registers,
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=sample_options,
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Required(
+                    CONF_FAST_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL
+                    ),
+                ): vol.All(
+                    vol.Coerce(float),
+                    vol.Range(
+                        min=0.1, max=60
+                    ),  # seconds between fast path reads for load control subscribers
+                ),
+                vol.Required(
+                    CONF_CAPTURE,
+                    default=self.config_entry.options.get(
+                        CONF_CAPTURE, DEFAULT_CAPTURE
+                    ),
+                ): bool,  # record raw register reads to <config>/ha_sdm630/ for troubleshooting
+                vol.Required(
+                    CONF_CAPTURE_MAX_SIZE,
+                    default=self.config_entry.options.get(
+                        CONF_CAPTURE_MAX_SIZE, DEFAULT_CAPTURE_MAX_SIZE
+                    ),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(
+                        min=1, max=1000
+                    ),  # MB per capture file, two rotated files are kept
+                ),
+                vol.Required(
+                    CONF_MAX_REGISTERS,
+                    default=current_max_registers,
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(
+                        min=2, max=DEFAULT_MAX_REGISTERS
+                    ),  # lower it for gateways that mangle large responses
                 ),
             }
         )
 
+        if self.config_entry.data.get(CONF_CONNECTION_TYPE) == CONNECTION_TYPE_TCP:
+            # Extra sockets let several reads be in flight, only if the gateway accepts them
+            data_schema = data_schema.extend(
+                {
+                    vol.Required(
+                        CONF_TCP_CONNECTIONS,
+                        default=self.config_entry.options.get(
+                            CONF_TCP_CONNECTIONS, DEFAULT_TCP_CONNECTIONS
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_TCP_CONNECTIONS)
+                    ),
+                }
+            )
+
         return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -11,6 +11,8 @@ CONNECTION_TYPE_TCP = "tcp"
 CONF_SLAVE_ID = "slave_id"
 CONF_NAME = "name"
 CONF_REGISTER_SET = "register_set"
+CONF_MAX_REGISTERS = "max_registers"
+CONF_CAPABILITY_PROFILE = "capability_profile"
 
 # Serial settings
 CONF_SERIAL_PORT = "serial_port"
@@ -19,19 +21,205 @@ CONF_PARITY = "parity"
 CONF_STOPBITS = "stopbits"
 CONF_BYTESIZE = "bytesize"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MEDIUM_INTERVAL = "medium_interval"
+CONF_SLOW_INTERVAL = "slow_interval"
+CONF_DEADBAND_SCALE = "deadband_scale"
+CONF_MAX_STATE_AGE = "max_state_age"
+CONF_STALE_AFTER = "stale_after"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_SAMPLED_REGISTERS = "sampled_registers"
+CONF_FAST_INTERVAL = "fast_interval"
+CONF_CAPTURE = "capture"
+CONF_CAPTURE_MAX_SIZE = "capture_max_size"
 
 # TCP settings
 CONF_HOST = "host"
 CONF_PORT = "port"
+CONF_TCP_CONNECTIONS = "tcp_connections"
+
+# Bus scan (config flow only)
+CONF_SCAN_BAUDRATES = "baudrates"
+CONF_SCAN_PARITIES = "parities"
+CONF_SCAN_FIRST_SLAVE = "first_slave"
+CONF_SCAN_LAST_SLAVE = "last_slave"
+CONF_SCAN_EXPECTED = "expected_meters"
+CONF_SCAN_SLAVES = "slaves"
 
 # Defaults
 DEFAULT_SLAVE_ID = 1
 DEFAULT_BAUDRATE = 9600
 DEFAULT_TCP_PORT = 502
+DEFAULT_REQUEST_TIMEOUT = 5  # seconds, until a hub has learned its bus's response times
+DEFAULT_TCP_CONNECTIONS = 1
+MAX_TCP_CONNECTIONS = 4
 DEFAULT_REGISTER_SET = "basic"
 DEFAULT_STOPBITS = 1
 DEFAULT_BYTESIZE = 8
 DEFAULT_PARITY = "N"
+DEFAULT_MAX_REGISTERS = 125  # Modbus limit for a single read request
+DEFAULT_UPDATE_INTERVAL = 10
+DEFAULT_MEDIUM_INTERVAL = 10
+DEFAULT_SLOW_INTERVAL = 60
+DEFAULT_DEADBAND_SCALE = 1.0  # 0 = only skip unchanged values
+DEFAULT_MAX_STATE_AGE = 300  # seconds, state is written at least this often
+DEFAULT_STALE_AFTER = 120  # seconds a last known value is served after failed reads
+DEFAULT_SAMPLE_INTERVAL = 0  # seconds, 0 disables high-rate sampling
+DEFAULT_FAST_INTERVAL = (
+    1.0  # seconds between fast path reads, while anything subscribes
+)
+DEFAULT_SAMPLED_REGISTERS = [
+    "total_system_power",
+    "phase_1_power",
+    "phase_2_power",
+    "phase_3_power",
+]
+DEFAULT_CAPTURE = False
+DEFAULT_CAPTURE_MAX_SIZE = 10  # MB per capture file
+
+# What an option that was never saved in the options form amounts to
+OPTION_DEFAULTS = {
+    CONF_REGISTER_SET: DEFAULT_REGISTER_SET,
+    CONF_MAX_REGISTERS: DEFAULT_MAX_REGISTERS,
+    CONF_TCP_CONNECTIONS: DEFAULT_TCP_CONNECTIONS,
+    CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
+    CONF_MEDIUM_INTERVAL: DEFAULT_MEDIUM_INTERVAL,
+    CONF_SLOW_INTERVAL: DEFAULT_SLOW_INTERVAL,
+    CONF_DEADBAND_SCALE: DEFAULT_DEADBAND_SCALE,
+    CONF_MAX_STATE_AGE: DEFAULT_MAX_STATE_AGE,
+    CONF_STALE_AFTER: DEFAULT_STALE_AFTER,
+    CONF_SAMPLE_INTERVAL: DEFAULT_SAMPLE_INTERVAL,
+    CONF_SAMPLED_REGISTERS: DEFAULT_SAMPLED_REGISTERS,
+    CONF_FAST_INTERVAL: DEFAULT_FAST_INTERVAL,
+    CONF_CAPTURE: DEFAULT_CAPTURE,
+    CONF_CAPTURE_MAX_SIZE: DEFAULT_CAPTURE_MAX_SIZE,
+}
+CAPTURE_BACKUPS = 2  # rotated capture files kept next to the current one
+
+# Consecutive failed large reads before a hub halves its block size
+PROFILE_FALLBACK_ERRORS = 3
+# Seconds before a hub below its cap probes for larger blocks again
+PROFILE_REPROBE_INTERVAL = 3600
+
+# Polling tiers: fast runs every update_interval, the others at their own interval.
+# A register can pin its tier with a "tier" key, otherwise planner.register_tier decides.
+TIER_FAST = "fast"  # power and current, used for load control
+TIER_MEDIUM = "medium"  # voltages, frequency, power factor, angles
+TIER_SLOW = "slow"  # energy counters, THD and demand registers
+
+# State write deadbands per device class: (absolute in native unit, relative to last value).
+# A new value is only written when it moves more than the larger of both, scaled by the
+# deadband_scale option. A register can override this with a "deadband" key. Registers
+# without a deadband still skip values that are unchanged at their precision.
+DEADBANDS = {
+    "voltage": (0.5, 0.0),
+    "current": (0.05, 0.01),
+    "power": (5.0, 0.01),
+    "apparent_power": (5.0, 0.01),
+    "reactive_power": (5.0, 0.01),
+    "frequency": (0.02, 0.0),
+    "power_factor": (0.01, 0.0),
+}
+
+# Diagnostic sensors per meter, values from HA_SDM630Coordinator.diagnostic_values().
+# "hub": True values are shared by all meters on the same serial port or gateway,
+# only the hub's first entry creates them. hub_request_timeout is this meter's own.
+DIAGNOSTIC_SENSORS = {
+    "poll_duration": {
+        "name": "Poll Duration",
+        "unit": "ms",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "precision": 0,
+        "enabled_default": False,
+    },
+    "poll_duration_p95": {
+        "name": "Poll Duration p95",
+        "unit": "ms",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "precision": 0,
+        "enabled_default": False,
+    },
+    "requests_per_cycle": {
+        "name": "Requests Per Cycle",
+        "unit": None,
+        "state_class": "measurement",
+        "precision": 0,
+        "enabled_default": False,
+    },
+    "retries": {
+        "name": "Block Retries",
+        "unit": None,
+        "state_class": "total_increasing",
+        "precision": 0,
+        "enabled_default": False,
+    },
+    "quarantined_blocks": {
+        "name": "Quarantined Blocks",
+        "unit": None,
+        "state_class": "measurement",
+        "precision": 0,
+        "enabled_default": False,
+    },
+    "hub_request_latency_p95": {
+        "name": "Hub Request Latency p95",
+        "unit": "ms",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "precision": 1,
+        "enabled_default": False,
+        "hub": True,
+    },
+    "hub_failed_requests": {
+        "name": "Hub Failed Requests",
+        "unit": None,
+        "state_class": "total_increasing",
+        "precision": 0,
+        "enabled_default": False,
+        "hub": True,
+    },
+    "hub_reconnects": {
+        "name": "Hub Reconnects",
+        "unit": None,
+        "state_class": "total_increasing",
+        "precision": 0,
+        "enabled_default": False,
+        "hub": True,
+    },
+    "hub_bytes_on_wire": {
+        "name": "Hub Bytes On Wire",
+        "unit": "B",
+        "device_class": "data_size",
+        "state_class": "total_increasing",
+        "precision": 0,
+        "enabled_default": False,
+        "hub": True,
+    },
+    "hub_sleep_time": {
+        "name": "Hub Sleep Time",
+        "unit": "s",
+        "device_class": "duration",
+        "state_class": "total_increasing",
+        "precision": 1,
+        "enabled_default": False,
+        "hub": True,
+    },
+    "hub_request_timeout": {
+        "name": "Hub Request Timeout",
+        "unit": "ms",
+        "device_class": "duration",
+        "state_class": "measurement",
+        "precision": 0,
+        "enabled_default": False,
+    },
+}
+
+# Dispatcher signal of a meter's fast path (format with the entry ID), sent with
+# {key: value} of the subscribed registers, see HA_SDM630Coordinator.async_subscribe_fast
+SIGNAL_FAST_VALUES = f"{DOMAIN}_fast_values_{{}}"
+
+# Registers with a "derived": (op, (source keys)) entry are computed from other registers
+# of the same set instead of being read, see planner.DERIVE_OPS for the operations.
 
 # Register set options
 REGISTER_SET_BASIC = "basic"
@@ -41,22 +229,135 @@ REGISTER_SET_FULL = "full"
 # Define the three register sets
 _BASIC_REGISTERS = {
     # Essential sensors — fast polling
-    "phase_1_l_n_volts": {"address": 0, "name": "Phase 1 L/N Volts", "unit": "V", "device_class": "voltage", "state_class": "measurement", "precision": 2},
-    "phase_2_l_n_volts": {"address": 2, "name": "Phase 2 L/N Volts", "unit": "V", "device_class": "voltage", "state_class": "measurement", "precision": 2},
-    "phase_3_l_n_volts": {"address": 4, "name": "Phase 3 L/N Volts", "unit": "V", "device_class": "voltage", "state_class": "measurement", "precision": 2},
-    "phase_1_current": {"address": 6, "name": "Phase 1 Current", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "phase_2_current": {"address": 8, "name": "Phase 2 Current", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "phase_3_current": {"address": 10, "name": "Phase 3 Current", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "phase_1_power": {"address": 12, "name": "Phase 1 Power", "unit": "W", "device_class": "power", "state_class": "measurement", "precision": 2},
-    "phase_2_power": {"address": 14, "name": "Phase 2 Power", "unit": "W", "device_class": "power", "state_class": "measurement", "precision": 2},
-    "phase_3_power": {"address": 16, "name": "Phase 3 Power", "unit": "W", "device_class": "power", "state_class": "measurement", "precision": 2},
-    "total_system_power": {"address": 52, "name": "Total Power", "unit": "W", "device_class": "power", "state_class": "measurement", "precision": 2},
-    "frequency": {"address": 70, "name": "Frequency", "unit": "Hz", "device_class": "frequency", "state_class": "measurement", "precision": 2},
-    "import_energy": {"address": 72, "name": "Import Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "export_energy": {"address": 74, "name": "Export Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "total_kwh": {"address": 342, "name": "Total kWh", "unit": "kWh", "device_class": "energy", "state_class": "total", "precision": 2},
-    "import_varh_since_last_reset": {"address": 76, "name": "Import VArh Since Last Reset", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
-    "export_varh_since_last_reset": {"address": 78, "name": "Export VArh Since Last Reset", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
+    "phase_1_l_n_volts": {
+        "address": 0,
+        "name": "Phase 1 L/N Volts",
+        "unit": "V",
+        "device_class": "voltage",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_2_l_n_volts": {
+        "address": 2,
+        "name": "Phase 2 L/N Volts",
+        "unit": "V",
+        "device_class": "voltage",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_3_l_n_volts": {
+        "address": 4,
+        "name": "Phase 3 L/N Volts",
+        "unit": "V",
+        "device_class": "voltage",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_1_current": {
+        "address": 6,
+        "name": "Phase 1 Current",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_2_current": {
+        "address": 8,
+        "name": "Phase 2 Current",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_3_current": {
+        "address": 10,
+        "name": "Phase 3 Current",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_1_power": {
+        "address": 12,
+        "name": "Phase 1 Power",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_2_power": {
+        "address": 14,
+        "name": "Phase 2 Power",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_3_power": {
+        "address": 16,
+        "name": "Phase 3 Power",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "total_system_power": {
+        "address": 52,
+        "name": "Total Power",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "frequency": {
+        "address": 70,
+        "name": "Frequency",
+        "unit": "Hz",
+        "device_class": "frequency",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "import_energy": {
+        "address": 72,
+        "name": "Import Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "export_energy": {
+        "address": 74,
+        "name": "Export Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "total_kwh": {
+        "address": 342,
+        "name": "Total kWh",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total",
+        "precision": 2,
+        "derived": ("sum", ("import_energy", "export_energy")),
+    },
+    "import_varh_since_last_reset": {
+        "address": 76,
+        "name": "Import VArh Since Last Reset",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "export_varh_since_last_reset": {
+        "address": 78,
+        "name": "Export VArh Since Last Reset",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
 }
 
 _BASIC_PLUS_REGISTERS = {
@@ -73,67 +374,524 @@ _BASIC_PLUS_REGISTERS = {
     "line_3_to_line_1_volts": {"address": 204, "name": "Line 3 to Line 1 Volts", "unit": "V", "device_class": "voltage", "state_class": "measurement", "precision": 2},
 }
 
+# Registers few installs need are created disabled ("enabled_default": False) and are
+# only polled once their entity is enabled
 _FULL_REGISTERS = {
     **_BASIC_PLUS_REGISTERS,
-    "phase_1_volt_amps_reactive": {"address": 24, "name": "Phase 1 Volt Amps Reactive", "unit": "VAr", "device_class": "reactive_power", "state_class": "measurement", "precision": 2},
-    "phase_2_volt_amps_reactive": {"address": 26, "name": "Phase 2 Volt Amps Reactive", "unit": "VAr", "device_class": "reactive_power", "state_class": "measurement", "precision": 2},
-    "phase_3_volt_amps_reactive": {"address": 28, "name": "Phase 3 Volt Amps Reactive", "unit": "VAr", "device_class": "reactive_power", "state_class": "measurement", "precision": 2},
-    "phase_1_phase_angle": {"address": 36, "name": "Phase 1 Phase Angle", "unit": "deg", "state_class": "measurement", "precision": 2},
-    "phase_2_phase_angle": {"address": 38, "name": "Phase 2 Phase Angle", "unit": "deg", "state_class": "measurement", "precision": 2},
-    "phase_3_phase_angle": {"address": 40, "name": "Phase 3 Phase Angle", "unit": "deg", "state_class": "measurement", "precision": 2},
-    "average_line_to_neutral_volts": {"address": 42, "name": "Average Line to Neutral Volts", "unit": "V", "device_class": "voltage", "state_class": "measurement", "precision": 2},
-    "average_line_current": {"address": 46, "name": "Average Line Current", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "sum_of_line_currents": {"address": 48, "name": "Sum of Line Currents", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "total_system_volt_amps": {"address": 56, "name": "Total System Volt Amps", "unit": "VA", "device_class": "apparent_power", "state_class": "measurement", "precision": 2},
-    "total_system_var": {"address": 60, "name": "Total System VAr", "unit": "VAr", "device_class": "reactive_power", "state_class": "measurement", "precision": 2,"word_order": "BA"},
-    "total_system_power_factor": {"address": 62, "name": "Total System Power Factor", "unit": None, "device_class": "power_factor", "state_class": "measurement", "precision": 3},
-    "total_system_phase_angle": {"address": 66, "name": "Total System Phase Angle", "unit": "deg", "state_class": "measurement", "precision": 2},
-    "vah_since_last_reset": {"address": 80, "name": "VAh Since Last Reset", "unit": "kVAh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "ah_since_last_reset": {"address": 82, "name": "Ah Since Last Reset", "unit": "Ah", "state_class": "total_increasing", "precision": 2},
-    "total_system_power_demand": {"address": 84, "name": "Total System Power Demand", "unit": "W", "device_class": "power", "state_class": "measurement", "precision": 2},
-    "maximum_total_system_power_demand": {"address": 86, "name": "Maximum Total System Power Demand", "unit": "W", "device_class": "power", "state_class": "measurement", "precision": 2},
-    "total_system_va_demand": {"address": 100, "name": "Total System VA Demand", "unit": "VA", "device_class": "apparent_power", "state_class": "measurement", "precision": 2},
-    "maximum_total_system_va_demand": {"address": 102, "name": "Maximum Total System VA Demand", "unit": "VA", "device_class": "apparent_power", "state_class": "measurement", "precision": 2},
-    "neutral_current_demand": {"address": 104, "name": "Neutral Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "maximum_neutral_current_demand": {"address": 106, "name": "Maximum Neutral Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "phase_1_l_n_volts_thd": {"address": 234, "name": "Phase 1 L/N Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "phase_2_l_n_volts_thd": {"address": 236, "name": "Phase 2 L/N Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "phase_3_l_n_volts_thd": {"address": 238, "name": "Phase 3 L/N Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "phase_1_current_thd": {"address": 240, "name": "Phase 1 Current THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "phase_2_current_thd": {"address": 242, "name": "Phase 2 Current THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "phase_3_current_thd": {"address": 244, "name": "Phase 3 Current THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "average_line_to_neutral_volts_thd": {"address": 248, "name": "Average Line to Neutral Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "average_line_current_thd": {"address": 250, "name": "Average Line Current THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "total_system_power_factor_s": {"address": 254, "name": "Total System Power Factor Signed", "unit": None, "state_class": "measurement", "precision": 2},
-    "phase_1_current_demand": {"address": 258, "name": "Phase 1 Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "phase_2_current_demand": {"address": 260, "name": "Phase 2 Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "phase_3_current_demand": {"address": 262, "name": "Phase 3 Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "maximum_phase_1_current_demand": {"address": 264, "name": "Maximum Phase 1 Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "maximum_phase_2_current_demand": {"address": 266, "name": "Maximum Phase 2 Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "maximum_phase_3_current_demand": {"address": 268, "name": "Maximum Phase 3 Current Demand", "unit": "A", "device_class": "current", "state_class": "measurement", "precision": 2},
-    "line_1_to_line_2_volts_thd": {"address": 334, "name": "Line 1 to Line 2 Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "line_2_to_line_3_volts_thd": {"address": 336, "name": "Line 2 to Line 3 Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "line_3_to_line_1_volts_thd": {"address": 338, "name": "Line 3 to Line 1 Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "average_line_to_line_volts_thd": {"address": 340, "name": "Average Line to Line Volts THD", "unit": "%", "state_class": "measurement", "precision": 2},
-    "total_kvarh": {"address": 344, "name": "Total kVArh", "unit": "kVArh", "device_class": None, "state_class": "total", "precision": 2},
-    "l1_import_active_energy": {"address": 346, "name": "L1 Import Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "l2_import_active_energy": {"address": 348, "name": "L2 Import Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "l3_import_active_energy": {"address": 350, "name": "L3 Import Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "l1_export_active_energy": {"address": 352, "name": "L1 Export Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "l2_export_active_energy": {"address": 354, "name": "L2 Export Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "l3_export_active_energy": {"address": 356, "name": "L3 Export Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total_increasing", "precision": 2},
-    "l1_total_active_energy": {"address": 358, "name": "L1 Total Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total", "precision": 2},
-    "l2_total_active_energy": {"address": 360, "name": "L2 Total Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total", "precision": 2},
-    "l3_total_active_energy": {"address": 362, "name": "L3 Total Active Energy", "unit": "kWh", "device_class": "energy", "state_class": "total", "precision": 2},
-    "l1_import_reactive_energy": {"address": 364, "name": "L1 Import Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
-    "l2_import_reactive_energy": {"address": 366, "name": "L2 Import Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
-    "l3_import_reactive_energy": {"address": 368, "name": "L3 Import Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
-    "l1_export_reactive_energy": {"address": 370, "name": "L1 Export Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
-    "l2_export_reactive_energy": {"address": 372, "name": "L2 Export Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
-    "l3_export_reactive_energy": {"address": 374, "name": "L3 Export Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total_increasing", "precision": 2},
-    "l1_total_reactive_energy": {"address": 376, "name": "L1 Total Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total", "precision": 2},
-    "l2_total_reactive_energy": {"address": 378, "name": "L2 Total Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total", "precision": 2},
-    "l3_total_reactive_energy": {"address": 380, "name": "L3 Total Reactive Energy", "unit": "kVArh", "device_class": None, "state_class": "total", "precision": 2},
+    "phase_1_volt_amps_reactive": {
+        "address": 24,
+        "name": "Phase 1 Volt Amps Reactive",
+        "unit": "VAr",
+        "device_class": "reactive_power",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_2_volt_amps_reactive": {
+        "address": 26,
+        "name": "Phase 2 Volt Amps Reactive",
+        "unit": "VAr",
+        "device_class": "reactive_power",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_3_volt_amps_reactive": {
+        "address": 28,
+        "name": "Phase 3 Volt Amps Reactive",
+        "unit": "VAr",
+        "device_class": "reactive_power",
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_1_phase_angle": {
+        "address": 36,
+        "name": "Phase 1 Phase Angle",
+        "unit": "deg",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_2_phase_angle": {
+        "address": 38,
+        "name": "Phase 2 Phase Angle",
+        "unit": "deg",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_3_phase_angle": {
+        "address": 40,
+        "name": "Phase 3 Phase Angle",
+        "unit": "deg",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "average_line_to_neutral_volts": {
+        "address": 42,
+        "name": "Average Line to Neutral Volts",
+        "unit": "V",
+        "device_class": "voltage",
+        "state_class": "measurement",
+        "precision": 2,
+        "derived": (
+            "avg",
+            ("phase_1_l_n_volts", "phase_2_l_n_volts", "phase_3_l_n_volts"),
+        ),
+    },
+    "average_line_current": {
+        "address": 46,
+        "name": "Average Line Current",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "derived": ("avg", ("phase_1_current", "phase_2_current", "phase_3_current")),
+    },
+    "sum_of_line_currents": {
+        "address": 48,
+        "name": "Sum of Line Currents",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "derived": ("sum", ("phase_1_current", "phase_2_current", "phase_3_current")),
+    },
+    "total_system_volt_amps": {
+        "address": 56,
+        "name": "Total System Volt Amps",
+        "unit": "VA",
+        "device_class": "apparent_power",
+        "state_class": "measurement",
+        "precision": 2,
+        "derived": (
+            "sum",
+            ("phase_1_volt_amps", "phase_2_volt_amps", "phase_3_volt_amps"),
+        ),
+    },
+    "total_system_var": {
+        "address": 60,
+        "name": "Total System VAr",
+        "unit": "VAr",
+        "device_class": "reactive_power",
+        "state_class": "measurement",
+        "precision": 2,
+        "word_order": "BA",
+    },
+    "total_system_power_factor": {
+        "address": 62,
+        "name": "Total System Power Factor",
+        "unit": None,
+        "device_class": "power_factor",
+        "state_class": "measurement",
+        "precision": 3,
+    },
+    "total_system_phase_angle": {
+        "address": 66,
+        "name": "Total System Phase Angle",
+        "unit": "deg",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "vah_since_last_reset": {
+        "address": 80,
+        "name": "VAh Since Last Reset",
+        "unit": "kVAh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "ah_since_last_reset": {
+        "address": 82,
+        "name": "Ah Since Last Reset",
+        "unit": "Ah",
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "total_system_power_demand": {
+        "address": 84,
+        "name": "Total System Power Demand",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "maximum_total_system_power_demand": {
+        "address": 86,
+        "name": "Maximum Total System Power Demand",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "total_system_va_demand": {
+        "address": 100,
+        "name": "Total System VA Demand",
+        "unit": "VA",
+        "device_class": "apparent_power",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "maximum_total_system_va_demand": {
+        "address": 102,
+        "name": "Maximum Total System VA Demand",
+        "unit": "VA",
+        "device_class": "apparent_power",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "neutral_current_demand": {
+        "address": 104,
+        "name": "Neutral Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "maximum_neutral_current_demand": {
+        "address": 106,
+        "name": "Maximum Neutral Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_1_l_n_volts_thd": {
+        "address": 234,
+        "name": "Phase 1 L/N Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_2_l_n_volts_thd": {
+        "address": 236,
+        "name": "Phase 2 L/N Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_3_l_n_volts_thd": {
+        "address": 238,
+        "name": "Phase 3 L/N Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_1_current_thd": {
+        "address": 240,
+        "name": "Phase 1 Current THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_2_current_thd": {
+        "address": 242,
+        "name": "Phase 2 Current THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_3_current_thd": {
+        "address": 244,
+        "name": "Phase 3 Current THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "average_line_to_neutral_volts_thd": {
+        "address": 248,
+        "name": "Average Line to Neutral Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "average_line_current_thd": {
+        "address": 250,
+        "name": "Average Line Current THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "total_system_power_factor_s": {
+        "address": 254,
+        "name": "Total System Power Factor Signed",
+        "unit": None,
+        "state_class": "measurement",
+        "precision": 2,
+    },
+    "phase_1_current_demand": {
+        "address": 258,
+        "name": "Phase 1 Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_2_current_demand": {
+        "address": 260,
+        "name": "Phase 2 Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "phase_3_current_demand": {
+        "address": 262,
+        "name": "Phase 3 Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "maximum_phase_1_current_demand": {
+        "address": 264,
+        "name": "Maximum Phase 1 Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "maximum_phase_2_current_demand": {
+        "address": 266,
+        "name": "Maximum Phase 2 Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "maximum_phase_3_current_demand": {
+        "address": 268,
+        "name": "Maximum Phase 3 Current Demand",
+        "unit": "A",
+        "device_class": "current",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "line_1_to_line_2_volts_thd": {
+        "address": 334,
+        "name": "Line 1 to Line 2 Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "line_2_to_line_3_volts_thd": {
+        "address": 336,
+        "name": "Line 2 to Line 3 Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "line_3_to_line_1_volts_thd": {
+        "address": 338,
+        "name": "Line 3 to Line 1 Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "average_line_to_line_volts_thd": {
+        "address": 340,
+        "name": "Average Line to Line Volts THD",
+        "unit": "%",
+        "state_class": "measurement",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "total_kvarh": {
+        "address": 344,
+        "name": "Total kVArh",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total",
+        "precision": 2,
+        "derived": (
+            "sum",
+            ("import_varh_since_last_reset", "export_varh_since_last_reset"),
+        ),
+    },
+    "l1_import_active_energy": {
+        "address": 346,
+        "name": "L1 Import Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "l2_import_active_energy": {
+        "address": 348,
+        "name": "L2 Import Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "l3_import_active_energy": {
+        "address": 350,
+        "name": "L3 Import Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "l1_export_active_energy": {
+        "address": 352,
+        "name": "L1 Export Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "l2_export_active_energy": {
+        "address": 354,
+        "name": "L2 Export Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "l3_export_active_energy": {
+        "address": 356,
+        "name": "L3 Export Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "precision": 2,
+    },
+    "l1_total_active_energy": {
+        "address": 358,
+        "name": "L1 Total Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total",
+        "precision": 2,
+        "derived": ("sum", ("l1_import_active_energy", "l1_export_active_energy")),
+    },
+    "l2_total_active_energy": {
+        "address": 360,
+        "name": "L2 Total Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total",
+        "precision": 2,
+        "derived": ("sum", ("l2_import_active_energy", "l2_export_active_energy")),
+    },
+    "l3_total_active_energy": {
+        "address": 362,
+        "name": "L3 Total Active Energy",
+        "unit": "kWh",
+        "device_class": "energy",
+        "state_class": "total",
+        "precision": 2,
+        "derived": ("sum", ("l3_import_active_energy", "l3_export_active_energy")),
+    },
+    "l1_import_reactive_energy": {
+        "address": 364,
+        "name": "L1 Import Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "l2_import_reactive_energy": {
+        "address": 366,
+        "name": "L2 Import Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "l3_import_reactive_energy": {
+        "address": 368,
+        "name": "L3 Import Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "l1_export_reactive_energy": {
+        "address": 370,
+        "name": "L1 Export Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "l2_export_reactive_energy": {
+        "address": 372,
+        "name": "L2 Export Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "l3_export_reactive_energy": {
+        "address": 374,
+        "name": "L3 Export Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total_increasing",
+        "precision": 2,
+        "enabled_default": False,
+    },
+    "l1_total_reactive_energy": {
+        "address": 376,
+        "name": "L1 Total Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total",
+        "precision": 2,
+        "enabled_default": False,
+        "derived": ("sum", ("l1_import_reactive_energy", "l1_export_reactive_energy")),
+    },
+    "l2_total_reactive_energy": {
+        "address": 378,
+        "name": "L2 Total Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total",
+        "precision": 2,
+        "enabled_default": False,
+        "derived": ("sum", ("l2_import_reactive_energy", "l2_export_reactive_energy")),
+    },
+    "l3_total_reactive_energy": {
+        "address": 380,
+        "name": "L3 Total Reactive Energy",
+        "unit": "kVArh",
+        "device_class": None,
+        "state_class": "total",
+        "precision": 2,
+        "enabled_default": False,
+        "derived": ("sum", ("l3_import_reactive_energy", "l3_export_reactive_energy")),
+    },
 }
 
 REGISTER_SETS = {
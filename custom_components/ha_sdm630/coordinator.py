@@ -1,12 +1,44 @@
 """Data update coordinator for SDM630 with proper async handling."""
 
+import asyncio
 import logging
-import struct
+import math
+import time
+from collections import Counter
 from datetime import timedelta
-from typing import Dict
-import asyncio
+from functools import lru_cache
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from pymodbus.exceptions import ModbusException, ConnectionException
+from pymodbus.exceptions import ConnectionException, ModbusException
+
+from .arbiter import PRIORITY_BULK, PRIORITY_NORMAL, PRIORITY_URGENT, DeadlineExpired
+from .breaker import BlockBreaker
+from .capture import (
+    STATUS_ERROR,
+    STATUS_EXCEPTION,
+    STATUS_OK,
+    STATUS_SHORT,
+    pack_record,
+)
+from .const import (
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_MEDIUM_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_STALE_AFTER,
+    REGISTER_SETS,
+    SIGNAL_FAST_VALUES,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SLOW,
+)
+from .metrics import MeterMetrics
+from .planner import compile_register_set, plan_register_set, polled_keys
+from .sampler import Sampler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,137 +47,570 @@ _LOGGER = logging.getLogger(__name__)
 logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
 logging.getLogger("pymodbus.logging").setLevel(logging.CRITICAL)
 
+# Bus priority of a block is that of its most urgent register
+TIER_PRIORITIES = {
+    TIER_FAST: PRIORITY_URGENT,
+    TIER_MEDIUM: PRIORITY_NORMAL,
+    TIER_SLOW: PRIORITY_BULK,
+}
+ALL_TIERS = frozenset(TIER_PRIORITIES)
+
+
+@lru_cache(maxsize=64)
+def shared_read_plan(
+    register_set: str,
+    tiers: frozenset,
+    max_registers: int,
+    keys: frozenset | None = None,
+) -> tuple:
+    """Read plan with bus priorities, shared by all meters with the same registers and block size."""
+    tier_of = compile_register_set(register_set).tiers
+    return tuple(
+        (
+            block,
+            min(
+                TIER_PRIORITIES.get(tier_of[key], PRIORITY_NORMAL)
+                for key, _ in block.keys
+            ),
+        )
+        for block in plan_register_set(register_set, tiers, max_registers, keys)
+    )
+
+
 class HA_SDM630Coordinator(DataUpdateCoordinator):
-    def __init__(self, hass, client, slave_id: int, register_map: dict, update_interval: timedelta = timedelta(seconds=10)):
+
+    def __init__(
+        self,
+        hass,
+        hub,
+        slave_id: int,
+        register_set: str,
+        update_interval: timedelta = timedelta(seconds=10),
+        tier_intervals: dict | None = None,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        sample_interval: float = 0,
+        sampled_keys=(),
+        fast_interval: float = DEFAULT_FAST_INTERVAL,
+    ):
         super().__init__(
             hass,
             _LOGGER,
             name="SDM630",
-            update_interval=update_interval,
+            update_interval=None,  # Polled by the hub's aligned cycle, see SDM630Hub.async_add_coordinator
         )
-        self.client = client  # ← Shared client
+        self.hub = hub
+        self.client = hub.client  # ← Shared client
         self.slave_id = slave_id
-        self.register_map = register_map
-        self._address_groups = self._group_addresses(register_map, max_registers=4)  # Use passed map
-        self.update_interval = update_interval
-
-    def _group_addresses(self, reg_map: dict, max_registers=4) -> Dict[int, list]:
-        """Group consecutive register addresses to minimize requests."""
-        addresses = sorted([(info["address"], key) for key, info in reg_map.items()])
-        groups = {}
-        current_start = None
-        current_keys = []
-
-        for addr, key in addresses:
-            if current_start is None:
-                current_start = addr
-                current_keys = [key]
-#            elif addr == current_start + len(current_keys) * 2:  # Consecutive (2 regs per float)
-#                current_keys.append(key)
-            else:
-                # Save previous group
- #               groups[current_start] = current_keys
- #               current_start = addr
- #               current_keys = [key]
-                current_size = len(current_keys) * 2
-                # Check for continuity AND max size
-                if (addr == current_start + current_size) and (current_size + 2 <= max_registers):
-                    current_keys.append(key)
-                else:
-                    groups[current_start] = current_keys
-                    current_start = addr
-                    current_keys = [key]
-        # Save last group
-        if current_start is not None:
-            groups[current_start] = current_keys
-
-        return groups
+        self.enabled_keys = (
+            None  # Keys with an enabled entity, None polls every register
+        )
+        self._tier_last_poll = {}
+        self._breaker = BlockBreaker()
+        self._timed_out = []  # Blocks that timed out this cycle
+        self._answered = False  # Whether the slave answered any block this cycle
+        self._silent = False  # The last cycle got no answer at all
+        self.metrics = MeterMetrics()
+        # Last known value per key: key -> (value, time.monotonic() of the read)
+        self._samples = {}
+        # High-rate sampling: the sampler loop reads the sampled keys every sample_interval into
+        # ring buffers, each update publishes their mean (state) and min/max/last (attributes)
+        self.sample_interval = sample_interval
+        self._sampled_setting = frozenset(sampled_keys)
+        self.aggregates = {}  # key -> SampleStats of the last publish window
+        # Raw capture (CaptureWriter) when enabled, records are flushed once per update
+        self.capture = None
+        self._capture_buffer = bytearray()
+        # Fast path: subscribed registers are read every fast_interval and dispatched
+        # as they are, bypassing entities and the recorder. Setup sets the entry's signal.
+        self.fast_signal = SIGNAL_FAST_VALUES.format(f"slave_{slave_id}")
+        self._fast_keys = Counter()  # key -> subscriptions
+        self._fast_subscribed = asyncio.Event()
+        self._register_listeners = []
+        self.reconfigure(
+            register_set, update_interval, tier_intervals, stale_after, fast_interval
+        )
+
+    def reconfigure(
+        self,
+        register_set: str,
+        update_interval: timedelta,
+        tier_intervals: dict | None = None,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        fast_interval: float = DEFAULT_FAST_INTERVAL,
+    ) -> None:
+        """Apply polling options in place, the next update reads with the new plan.
+
+        Register map listeners are called when the register set changed.
+        """
+        changed = register_set != getattr(self, "register_set", register_set)
+        # Register definitions are compiled once per set and shared by all meters
+        self.register_set = register_set
+        self.register_map = REGISTER_SETS[register_set]
+        self.poll_interval = update_interval.total_seconds()
+        # Seconds between polls per tier, the fast tier runs on every update
+        tier_intervals = {
+            TIER_MEDIUM: DEFAULT_MEDIUM_INTERVAL,
+            TIER_SLOW: DEFAULT_SLOW_INTERVAL,
+            **(tier_intervals or {}),
+        }
+        self.tier_intervals = {
+            tier: max(interval, self.poll_interval)
+            for tier, interval in tier_intervals.items()
+        }
+        self.tier_intervals[TIER_FAST] = self.poll_interval
+        self._tiers = compile_register_set(register_set).tiers
+        self._tier_last_poll.clear()  # Poll every tier next time, new registers get values right away
+        # A value is served until it is older than stale_after, but never expires
+        # before its tier had a chance to refresh it
+        self._stale_after = {
+            tier: max(stale_after, interval + self.poll_interval)
+            for tier, interval in self.tier_intervals.items()
+        }
+        for key in self._samples.keys() - self.register_map.keys():
+            del self._samples[key]
+        # Registers that are read, not derived: only those can be sampled or streamed
+        self._readable_keys = frozenset(
+            spec.key for spec in compile_register_set(register_set).specs
+        )
+        self._update_sampled_keys()
+        self.fast_interval = fast_interval
+        if changed:
+            for update_callback in list(self._register_listeners):
+                update_callback()
+
+    @callback
+    def async_add_register_listener(self, update_callback):
+        """Listen for register set changes, returns a remove function."""
+        self._register_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._register_listeners.remove(update_callback)
+
+        return remove_listener
+
+    def set_enabled_keys(self, keys) -> None:
+        """Poll only these registers, the next update uses the matching plan."""
+        keys = frozenset(keys) & self.register_map.keys()
+        for key in self.register_map.keys() - keys:
+            # Disabled, don't serve it from the cache either
+            self._samples.pop(key, None)
+        self.enabled_keys = keys
+        self._update_sampled_keys()
+
+    def _update_sampled_keys(self) -> None:
+        """Sample the configured registers that are read and needed by an enabled entity."""
+        keys = (
+            self._sampled_setting & self._readable_keys
+            if self.sample_interval
+            else frozenset()
+        )
+        polled = polled_keys(self.register_set, self.enabled_keys)
+        self.sampled_keys = keys if polled is None else keys & polled
+        self.aggregates = {
+            key: stats
+            for key, stats in self.aggregates.items()
+            if key in self.sampled_keys
+        }
+        # Room for two update intervals of samples, in case an update runs late
+        self._sampler = Sampler(
+            self.sampled_keys,
+            (
+                2 * math.ceil(self.poll_interval / self.sample_interval)
+                if self.sample_interval
+                else 1
+            ),
+        )
+
+    def sample_age(self, key: str) -> float | None:
+        """Seconds since the value of key was read from the meter."""
+        sample = self._samples.get(key)
+        return None if sample is None else time.monotonic() - sample[1]
+
+    @property
+    def quarantined_blocks(self) -> list:
+        """(start, count) of the blocks the breaker currently skips."""
+        return self._breaker.quarantined
+
+    def is_stale(self, key: str) -> bool:
+        """True once the value of key missed its tier's refresh (it is served until stale_after)."""
+        age = self.sample_age(key)
+        interval = self.tier_intervals.get(self._tiers.get(key))
+        return (
+            age is not None
+            and interval is not None
+            and age > interval + self.poll_interval
+        )
+
+    def diagnostic_values(self) -> dict:
+        """Current values of the diagnostic sensors, see DIAGNOSTIC_SENSORS."""
+        hub, meter = self.hub.metrics, self.metrics
+
+        def _ms(seconds):
+            return None if seconds is None else seconds * 1000
+
+        return {
+            "poll_duration": _ms(meter.poll_duration.last),
+            "poll_duration_p95": _ms(meter.poll_duration.percentile(95)),
+            "requests_per_cycle": meter.last_requests,
+            "retries": meter.retries,
+            "quarantined_blocks": len(self._breaker.quarantined),
+            "hub_request_latency_p95": _ms(hub.latency.percentile(95)),
+            "hub_failed_requests": hub.failed_requests,
+            "hub_reconnects": hub.reconnects,
+            "hub_bytes_on_wire": hub.bytes_sent + hub.bytes_received,
+            "hub_sleep_time": hub.sleep_time,
+            "hub_request_timeout": _ms(self.hub.request_timeout(self.slave_id)),
+        }
+
+    def _cached_data(self, now: float) -> dict:
+        """Return all cached values that are not stale yet."""
+        tiers, stale_after = self._tiers, self._stale_after
+        return {
+            key: value
+            for key, (value, read_at) in self._samples.items()
+            # A poll that started before a register set change may still add dropped keys
+            if key in tiers and now - read_at <= stale_after[tiers[key]]
+        }
+
+    def _due_tiers(self, now: float) -> frozenset:
+        """Return the tiers that need polling this cycle."""
+        # Allow half an update of jitter so a 60 s tier on a 10 s timer doesn't slip to 70 s
+        slack = self.poll_interval / 2
+        return frozenset(
+            tier
+            for tier, interval in self.tier_intervals.items()
+            if tier not in self._tier_last_poll
+            or now - self._tier_last_poll[tier] >= interval - slack
+        )
+
+    def read_plan(self, tiers: frozenset) -> tuple:
+        """Return the shared read plan covering the given tiers, with bus priorities."""
+        # Keyed on the hub's current block size, so a finished probe or a fallback replans
+        keys = polled_keys(self.register_set, self.enabled_keys)
+        if self.sampled_keys:
+            # Read by the sampler loop, published from its buffers
+            keys = frozenset(self._tiers if keys is None else keys) - self.sampled_keys
+        return shared_read_plan(self.register_set, tiers, self.hub.max_registers, keys)
+
+    async def async_run_sampler(self) -> None:
+        """Sample the sampled registers every sample_interval, until cancelled."""
+        next_run = time.monotonic()
+        while True:
+            next_run += self.sample_interval
+            self._sampler.add(
+                await self._async_read_urgent(self.sampled_keys, next_run)
+            )
+            next_run = await self._async_wait_until(next_run)
+
+    @callback
+    def async_subscribe_fast(self, keys, update_callback):
+        """Call update_callback(values) every fast_interval with fresh register values.
+
+        values holds every register subscribed on this meter, {key: value}.
+        The reads are urgent on the bus but skip the entity machinery, so
+        nothing reaches the recorder; the block breaker, metrics and capture
+        still see them like any other read. Listening to fast_signal directly
+        works too, as long as something subscribed the registers.
+        Only registers that are read can be subscribed, not derived ones.
+        Returns a function that unsubscribes.
+        """
+        keys = frozenset(keys)
+        unknown = keys - self._readable_keys
+        if unknown:
+            raise ValueError(f"Cannot subscribe to {', '.join(sorted(unknown))}")
+        self._fast_keys.update(keys)
+        self._fast_subscribed.set()
+        disconnect = async_dispatcher_connect(
+            self.hass, self.fast_signal, update_callback
+        )
+
+        @callback
+        def unsubscribe() -> None:
+            disconnect()
+            self._fast_keys.subtract(keys)
+            # Drop registers nobody subscribes anymore
+            self._fast_keys = +self._fast_keys
+            if not self._fast_keys:
+                self._fast_subscribed.clear()
+
+        return unsubscribe
+
+    async def async_run_fast_path(self) -> None:
+        """Read and dispatch the subscribed registers every fast_interval, until cancelled."""
+        while True:
+            await self._fast_subscribed.wait()  # Costs nothing while nobody subscribes
+            next_run = time.monotonic() + self.fast_interval
+            # Registers a register set change dropped stay subscribed, but can't be read
+            keys = self._readable_keys.intersection(self._fast_keys)
+            values = await self._async_read_urgent(keys, next_run)
+            if values:
+                async_dispatcher_send(self.hass, self.fast_signal, values)
+            await self._async_wait_until(next_run)
+
+    async def _async_read_urgent(self, keys: frozenset, deadline: float) -> dict:
+        """Read keys with urgent bus priority, return the decoded values that were read."""
+        values = {}
+        for block, _priority in shared_read_plan(
+            self.register_set, ALL_TIERS, self.hub.max_registers, keys
+        ):
+            try:
+                # A read that can't get the bus before the next one is due is dropped
+                block_values = await self._async_read_block(
+                    block, PRIORITY_URGENT, deadline
+                )
+            except ConnectionException as e:
+                _LOGGER.debug(f"Urgent read at {block.start} failed: {e}")
+                break
+            if block_values is None:
+                break  # No answer, don't queue more reads behind a silent slave
+            values.update(block_values)
+        return values
+
+    @staticmethod
+    async def _async_wait_until(next_run: float) -> float:
+        """Sleep until next_run and return it, or return now if that has passed."""
+        delay = next_run - time.monotonic()
+        if delay < 0:
+            # Fell behind, skip missed reads instead of bursting
+            return time.monotonic()
+        await asyncio.sleep(delay)
+        return next_run
+
+    def _publish_samples(self, now: float) -> None:
+        """Turn the samples taken since the last update into the published values."""
+        for key, stats in self._sampler.drain().items():
+            self.aggregates[key] = stats
+            precision = self.register_map[key].get("precision", 2)
+            self._samples[key] = (round(stats.mean, precision), now)
+
+    def _derive(self) -> None:
+        """Compute derived registers from the cached samples of their sources."""
+        samples, enabled = self._samples, self.enabled_keys
+        for key, op, sources, precision in compile_register_set(
+            self.register_set
+        ).derived:
+            if enabled is not None and key not in enabled:
+                continue
+            source_samples = [samples.get(source) for source in sources]
+            if None in source_samples:
+                continue  # Not read yet
+            values = [value for value, _read_at in source_samples]
+            value = None if None in values else round(op(values), precision)
+            # As old as its oldest source, so it goes stale together with them
+            samples[key] = (value, min(read_at for _value, read_at in source_samples))
+
+    def _cached_or_fail(self, message: str) -> dict:
+        """Serve cached values while the meter is unreachable, fail once all are stale."""
+        self.metrics.fail_cycle()
+        cached = self._cached_data(time.monotonic())
+        if not cached:
+            raise UpdateFailed(message)
+        _LOGGER.debug("%s, serving cached values", message)
+        return cached
 
     async def _async_connect(self) -> bool:
         """Connect to the device."""
+        return await self.hub.async_connect()
+
+    async def _async_read_block(
+        self, block, priority: int, deadline: float
+    ) -> dict | None:
+        """Read one block through the breaker, record it and cache its values.
+
+        Every read of the meter goes through here: polls, the sampler and the
+        fast path. Returns the decoded values ({} if the block was skipped or
+        refused), None if the slave didn't answer. Raises ConnectionException only.
+        """
+        start_addr, count = block.start, block.count
+        block_key = (start_addr, count)
+        if not self._breaker.allow(block_key, time.monotonic()):
+            return {}  # Quarantined, don't let one bad block cost bus time every cycle
+        metrics = self.metrics
+        retry = self._breaker.failing(block_key)
+        requested_at = time.time()
+        started = time.monotonic()
         try:
-            if not self.client.connected:
-                await self.client.connect()
-            return self.client.connected
-        except Exception as err:
-            _LOGGER.debug("Failed to connect to SDM630: %s", err)
-            return False
+            result = await self.hub.async_read(
+                start_addr, count, self.slave_id, priority=priority, deadline=deadline
+            )
+        except DeadlineExpired:
+            _LOGGER.debug(f"Bus busy, skipped read at {start_addr} this cycle")
+            metrics.skipped += 1
+            return {}
+        except ConnectionException:
+            metrics.record_request(retry)
+            metrics.record_block_error(start_addr, count)
+            self._capture(block, STATUS_ERROR, requested_at, started)
+            raise  # Transport is down, no point trying the other blocks
+        except ModbusException as e:
+            # Log as debug to reduce noise for expected transient errors
+            _LOGGER.debug(f"Modbus error reading address {start_addr}: {e}")
+            metrics.record_request(retry)
+            metrics.record_block_error(start_addr, count)
+            self._capture(block, STATUS_ERROR, requested_at, started)
+            # A timeout only points at the block (or its size) if the slave answers other reads
+            self._timed_out.append(block)
+            return None
+        if self._silent:
+            # The slave is back, blocks quarantined around the outage get a fresh start
+            self._silent = False
+            self._breaker.reset()
+        self._answered = True
+        metrics.record_request(retry)
+        if result.isError():
+            _LOGGER.debug(f"Read error at {start_addr}: {result}")
+            metrics.record_block_error(start_addr, count)
+            exception_code = getattr(result, "exception_code", 0) or 0
+            self._capture(
+                block,
+                STATUS_EXCEPTION,
+                requested_at,
+                started,
+                exception_code=exception_code,
+            )
+            self._breaker.record_failure(block_key, time.monotonic())
+            return {}
+
+        registers = result.registers
+        if len(registers) != count:
+            # Truncated frame, typical for gateways that can't handle the block size
+            _LOGGER.debug(
+                f"Short read at {start_addr}: {len(registers)} of {count} registers"
+            )
+            metrics.record_block_error(start_addr, count)
+            self._capture(block, STATUS_SHORT, requested_at, started, registers)
+            self.hub.record_block_result(count, False)
+            self._breaker.record_failure(block_key, time.monotonic())
+        else:
+            self._capture(block, STATUS_OK, requested_at, started, registers)
+            self.hub.record_block_result(count, True)
+            self._breaker.record_success(block_key)
+
+        read_at = time.monotonic()
+        values = block.decoder.decode(registers)
+        for key, value in values.items():
+            self._samples[key] = (value, read_at)
+        return values
 
     async def _async_update_data(self) -> dict:
+        """Run one poll cycle and record its metrics."""
+        self.metrics.start_cycle()
+        started = time.monotonic()
+        try:
+            return await self._async_poll()
+        except Exception:
+            self.metrics.fail_cycle()
+            raise
+        finally:
+            self.metrics.finish_cycle(time.monotonic() - started)
+            if self._capture_buffer:
+                await self._async_flush_capture()
+
+    def _capture(
+        self,
+        block,
+        status: int,
+        requested_at: float,
+        started: float,
+        registers=(),
+        exception_code: int = 0,
+    ) -> None:
+        """Buffer a raw capture record of one read, if capturing."""
+        if self.capture is not None:
+            self._capture_buffer += pack_record(
+                requested_at,
+                time.monotonic() - started,
+                self.slave_id,
+                status,
+                block.start,
+                block.count,
+                registers,
+                exception_code,
+            )
+
+    async def _async_flush_capture(self) -> None:
+        """Append the buffered capture records to the capture file."""
+        data = bytes(self._capture_buffer)
+        self._capture_buffer.clear()
+        try:
+            await self.hass.async_add_executor_job(self.capture.write, data)
+        except OSError as err:
+            _LOGGER.warning(
+                "Disabling raw capture, writing %s failed: %s", self.capture.path, err
+            )
+            self.capture = None
+
+    async def _async_poll(self) -> dict:
         """Fetch all data in batched async reads."""
         if not await self._async_connect():
-            raise UpdateFailed("Failed to connect to SDM630")
+            return self._cached_or_fail("Failed to connect to SDM630")
+
+        await self.hub.async_ensure_profile(self.slave_id)
 
-        new_data = {}
+        now = time.monotonic()
+        tiers = self._due_tiers(now)
 
+        # A read that can't get the bus within one update is stale, skip it
+        deadline = now + self.poll_interval
+
+        self._timed_out = []
+        self._answered = False
         try:
-            for start_addr, keys in self._address_groups.items():
-                count = len(keys) * 2  # 2 registers per float
-                try:
-                    result = await self.client.read_input_registers(
-                        address=start_addr,
-                        count=count,
-                        device_id=self.slave_id,
-                    )
-                except ModbusException as e:
-                    # Log as debug to reduce noise for expected transient errors
-                    _LOGGER.debug(f"Modbus error reading address {start_addr}: {e}")
-                    # Force reconnect on error to clear transaction ID mismatches
-                    self.client.close()
-                    await asyncio.sleep(0.5)
-                    await self._async_connect()
-                    continue        
-                if result.isError():
-                    _LOGGER.debug(f"Read error at {start_addr}: {result}")
-                    self.client.close()
-                    await asyncio.sleep(0.5)
-                    await self._async_connect()
-                    continue
-        
-                registers = result.registers
-        
-                for i, key in enumerate(keys):
-                    reg_offset = i * 2
-                    if reg_offset + 1 >= len(registers): # new
-                        break    
-                    reg1 = registers[reg_offset]
-                    reg2 = registers[reg_offset + 1]
-        
-                    # ---- SDM630 mixed word-order handling ----
-                    order = self.register_map[key].get("word_order", "AB")
-        
-                    if order == "AB":
-                        raw = struct.pack(">HH", reg1, reg2)
-                    elif order == "BA":
-                        raw = struct.pack(">HH", reg2, reg1)
-                    else:
-                        raise ValueError(f"Unknown word_order '{order}' for {key}")
-        
-                    value = struct.unpack(">f", raw)[0]
-                    # -----------------------------------------
-        
-                    # Handle NaN / invalid values
-                    if value != value:  # NaN check
-                        value = None
-                    else:
-                        precision = self.register_map[key].get("precision", 2)
-                        value = round(value, precision)
-        
-                    new_data[key] = value
-                # Small delay between requests to allow gateway buffer to clear
-                await asyncio.sleep(0.1)                
-        
-            return new_data
+            plan = self.read_plan(tiers)
+            if self.slave_id in self.hub.offline_slaves:
+                # Probe an offline slave with one block before the others take bus time
+                plan = list(plan)
+                while plan and not (self._answered or self._timed_out):
+                    block, priority = plan.pop(0)
+                    await self._async_read_block(block, priority, deadline)
+                if not self._answered:
+                    plan = []
+            if self.hub.arbiter.max_outstanding > 1:
+                # Pooled gateway connections, keep all of them busy
+                results = await asyncio.gather(
+                    *(
+                        self._async_read_block(block, priority, deadline)
+                        for block, priority in plan
+                    ),
+                    return_exceptions=True,
+                )
+                for result in results:
+                    if isinstance(result, BaseException):
+                        raise result
+            else:
+                for block, priority in plan:
+                    if self._timed_out and not self._answered:
+                        break  # Silent this cycle, don't wait for a timeout on every block
+                    await self._async_read_block(block, priority, deadline)
+
+            if self._answered:
+                failed_at = time.monotonic()
+                for block in self._timed_out:
+                    self.hub.record_block_result(block.count, False)
+                    self._breaker.record_failure((block.start, block.count), failed_at)
+            elif self._timed_out:
+                self._silent = True
+                return self._cached_or_fail(f"No response from slave {self.slave_id}")
+
+            for tier in tiers:
+                self._tier_last_poll[tier] = now
+            self._publish_samples(time.monotonic())
+            self._derive()
+            # Keys of failed or skipped blocks keep their last value until stale
+            return self._cached_data(time.monotonic())
 
         except ConnectionException as err:
-            # Force reconnect next time
-            await self.client.close()
-            raise UpdateFailed(f"Connection lost: {err}")
+            # The hub already dropped the connection, next update reconnects
+            return self._cached_or_fail(f"Connection lost: {err}")
 
         except ModbusException as err:
             raise UpdateFailed(f"Modbus error: {err}")
 
-        except Exception as err:
+        except UpdateFailed:
+            raise
+
+        except Exception as err:  # noqa: BLE001 - surfaced as a failed update
             _LOGGER.error("Unexpected error during SDM630 update: %s", err)
             raise UpdateFailed(f"Update failed: {err}")
 
@@ -0,0 +1,62 @@
+"""Diagnostics support for SDM630."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_HOST, DOMAIN
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry: hub state, read plan and metrics."""
+    entry_info = {
+        "data": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+    }
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if coordinator is None:
+        return {"entry": entry_info}
+
+    hub = coordinator.hub
+    plan = coordinator.read_plan(frozenset(coordinator.tier_intervals))
+    return {
+        "entry": entry_info,
+        "hub": {
+            "type": type(hub).__name__,
+            "max_registers": hub.max_registers,
+            "register_cap": hub.register_cap,
+            "device_max_registers": hub.device_max_registers,
+            "profile": hub.profile,
+            "connections": hub.connections,
+            "queued": hub.arbiter.queued,
+            "frame_gap": hub.frame_gap,
+            "reset_delay": hub.reset_delay,
+            "timeout": hub.timeout,
+            "offline_timeout": hub.offline_timeout,
+            "offline_slaves": sorted(hub.offline_slaves),
+            "metrics": hub.metrics.as_dict(),
+        },
+        "meter": {
+            "slave_id": coordinator.slave_id,
+            "registers": len(coordinator.register_map),
+            "tier_intervals": coordinator.tier_intervals,
+            "read_plan": [
+                {
+                    "start": block.start,
+                    "count": block.count,
+                    "values": len(block.keys),
+                    "priority": priority,
+                }
+                for block, priority in plan
+            ],
+            "quarantined_blocks": [
+                f"{start}+{count}" for start, count in coordinator.quarantined_blocks
+            ],
+            "last_update_success": coordinator.last_update_success,
+            "metrics": coordinator.metrics.as_dict(),
+        },
+    }
@@ -0,0 +1,136 @@
+"""Performance counters for hubs and meters."""
+
+from bisect import bisect_left
+from collections import deque
+
+# Upper bounds in seconds of the latency histogram buckets, plus one overflow bucket
+LATENCY_BUCKETS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+# Samples kept for the percentiles, recent enough to show a degrading gateway
+RECENT_SAMPLES = 200
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram plus percentiles over the recent samples."""
+
+    __slots__ = ("_recent", "count", "counts", "last", "max", "total")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+        self._recent = deque(maxlen=RECENT_SAMPLES)
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self._recent.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the pct percentile (0-100) of the recent samples."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def as_dict(self) -> dict:
+        buckets = {f"<={bound}": n for bound, n in zip(LATENCY_BUCKETS, self.counts)}
+        buckets[f">{LATENCY_BUCKETS[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+class HubMetrics:
+    """Transport level counters of one hub (shared by all meters on it)."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.failed_requests = (
+            0  # no (valid) response: timeouts, transport and framing errors
+        )
+        self.exception_responses = 0
+        self.reconnects = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.sleep_time = 0.0  # pacing gaps and error settling delays
+        self.bus_wait_time = 0.0  # time requests queued for the arbiter
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "exception_responses": self.exception_responses,
+            "reconnects": self.reconnects,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "sleep_time": round(self.sleep_time, 3),
+            "bus_wait_time": round(self.bus_wait_time, 3),
+            "latency": self.latency.as_dict(),
+        }
+
+
+class MeterMetrics:
+    """Poll cycle counters of one meter (coordinator)."""
+
+    def __init__(self) -> None:
+        self.cycles = 0
+        self.failed_cycles = 0
+        self.requests = 0
+        self.last_requests = 0  # requests in the last cycle
+        self.retries = 0  # reads of a block that failed the previous time
+        self.skipped = 0  # reads dropped because the bus was busy past the deadline
+        self.block_errors = {}  # "start+count" -> failed reads
+        self.poll_duration = LatencyHistogram()
+        self._cycle_requests = 0
+        self._cycle_failed = False
+
+    def start_cycle(self) -> None:
+        self._cycle_requests = 0
+        self._cycle_failed = False
+
+    def fail_cycle(self) -> None:
+        """Count the current cycle as failed (any block or the connection failed)."""
+        self._cycle_failed = True
+
+    def record_request(self, retry: bool) -> None:
+        self._cycle_requests += 1
+        self.requests += 1
+        if retry:
+            self.retries += 1
+
+    def record_block_error(self, start: int, count: int) -> None:
+        block = f"{start}+{count}"
+        self.block_errors[block] = self.block_errors.get(block, 0) + 1
+        self._cycle_failed = True
+
+    def finish_cycle(self, duration: float) -> None:
+        self.cycles += 1
+        if self._cycle_failed:
+            self.failed_cycles += 1
+        self.last_requests = self._cycle_requests
+        self.poll_duration.record(duration)
+
+    def as_dict(self) -> dict:
+        return {
+            "cycles": self.cycles,
+            "failed_cycles": self.failed_cycles,
+            "requests": self.requests,
+            "last_requests": self.last_requests,
+            "retries": self.retries,
+            "skipped": self.skipped,
+            "block_errors": dict(self.block_errors),
+            "poll_duration": self.poll_duration.as_dict(),
+        }
@@ -0,0 +1,353 @@
+"""Read planning for SDM630 register maps.
+
+Kept free of Home Assistant and pymodbus imports so the debug tooling can
+reuse it outside of Home Assistant.
+"""
+
+import math
+import struct
+from functools import cache, lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
+
+from .const import DEADBANDS, REGISTER_SETS, TIER_FAST, TIER_MEDIUM, TIER_SLOW
+
+# Modbus spec limit for a single read holding/input registers request
+MODBUS_MAX_READ_REGISTERS = 125
+
+# Every SDM630 value is an IEEE754 float spread over two registers
+REGISTERS_PER_VALUE = 2
+
+# Cost of one extra request expressed in registers (2 bytes each) that could
+# have been read instead. Covers request frame, response header/CRC, the
+# 3.5 character silences on RTU and the meter's turnaround time. At 9600 baud
+# a round trip costs roughly 40 byte times, so reading a gap of up to 20
+# unused registers is cheaper than issuing a second request.
+DEFAULT_FRAME_OVERHEAD = 20
+
+# Device classes that change fast enough to need the fast polling tier
+_FAST_DEVICE_CLASSES = ("power", "current", "apparent_power", "reactive_power")
+
+# Quiet NaN in both word orders, used to pad truncated frames
+_NAN_WORD = 0x7FC0
+
+# Operations for derived registers, see "derived" in const.py
+DERIVE_OPS = {
+    "sum": math.fsum,
+    "avg": lambda values: math.fsum(values) / len(values),
+}
+
+
+def register_tier(key: str, info: dict) -> str:
+    """Return the polling tier of a register."""
+    if "tier" in info:
+        return info["tier"]
+    if (
+        "thd" in key
+        or "demand" in key
+        or (info.get("state_class") or "").startswith("total")
+    ):
+        return TIER_SLOW
+    if info.get("device_class") in _FAST_DEVICE_CLASSES:
+        return TIER_FAST
+    return TIER_MEDIUM
+
+
+def register_deadband(info: dict, scale: float = 1.0) -> tuple[float, float]:
+    """Return the (absolute, relative) state write deadband of a register."""
+    absolute, relative = info.get(
+        "deadband", DEADBANDS.get(info.get("device_class"), (0.0, 0.0))
+    )
+    # Never below half a precision step, so values that round the same are always skipped
+    resolution = 10 ** -info.get("precision", 2) / 2
+    return max(absolute * scale, resolution), relative * scale
+
+
+class RegisterSpec(NamedTuple):
+    """Compiled, immutable description of one register (what reads and decodes need)."""
+
+    key: str
+    address: int
+    word_order: str
+    precision: int
+    tier: str
+
+
+class DerivedSpec(NamedTuple):
+    """A register computed from other registers instead of being read."""
+
+    key: str
+    op: object  # callable from DERIVE_OPS
+    sources: tuple
+    precision: int
+
+
+class RegisterSet(NamedTuple):
+    """A register set compiled once and shared by every meter using it."""
+
+    name: str
+    specs: tuple  # (RegisterSpec, ...) of the registers to read, sorted by address
+    tiers: MappingProxyType  # key -> tier, derived keys included
+    derived: tuple  # (DerivedSpec, ...)
+
+
+def _compile_specs(reg_map: dict) -> tuple:
+    """Compile the registers that are read over Modbus (derived ones are skipped)."""
+    return tuple(
+        sorted(
+            (
+                RegisterSpec(
+                    key,
+                    info["address"],
+                    info.get("word_order", "AB"),
+                    info.get("precision", 2),
+                    register_tier(key, info),
+                )
+                for key, info in reg_map.items()
+                if "derived" not in info
+            ),
+            key=lambda spec: (spec.address, spec.key),
+        )
+    )
+
+
+def _compile_derived(reg_map: dict) -> tuple:
+    derived = []
+    for key, info in reg_map.items():
+        if "derived" not in info:
+            continue
+        op, sources = info["derived"]
+        if op not in DERIVE_OPS:
+            raise ValueError(f"Unknown derive operation '{op}' for {key}")
+        for source in sources:
+            if source not in reg_map or "derived" in reg_map[source]:
+                raise ValueError(
+                    f"Register '{key}' must derive from read registers, not '{source}'"
+                )
+        derived.append(
+            DerivedSpec(key, DERIVE_OPS[op], tuple(sources), info.get("precision", 2))
+        )
+    return tuple(derived)
+
+
+@cache
+def compile_register_set(name: str) -> RegisterSet:
+    """Return the compiled form of one of the REGISTER_SETS."""
+    reg_map = REGISTER_SETS[name]
+    return RegisterSet(
+        name,
+        _compile_specs(reg_map),
+        MappingProxyType(
+            {key: register_tier(key, info) for key, info in reg_map.items()}
+        ),
+        _compile_derived(reg_map),
+    )
+
+
+@lru_cache(maxsize=64)
+def polled_keys(name: str, enabled: frozenset | None) -> frozenset | None:
+    """Return the keys to read so every enabled key, derived or not, can be served.
+
+    Sources of an enabled derived register are read even if their own entity
+    is disabled. None (every register) passes through.
+    """
+    if enabled is None:
+        return None
+    keys = set(enabled)
+    for derived in compile_register_set(name).derived:
+        if derived.key in enabled:
+            keys.update(derived.sources)
+    return frozenset(keys)
+
+
+class BlockDecoder:
+    """Precompiled decode plan for one read block.
+
+    The whole block is converted with a single struct pack/unpack pair.
+    Values stored in BA word order are swapped in the register list first,
+    gap registers are skipped by padding in the unpack format, and NaN
+    handling plus rounding happen in one pass over the result.
+    """
+
+    __slots__ = ("_ends", "_pack", "_precisions", "_swap", "_unpack", "count", "keys")
+
+    def __init__(self, count: int, fields: list) -> None:
+        """fields: [(key, register offset, word_order, precision), ...] sorted by offset."""
+        fmt = [">"]
+        swap = []
+        pos = 0
+        for key, offset, word_order, _precision in fields:
+            if offset < pos:
+                raise ValueError(f"Register '{key}' overlaps the previous value")
+            if word_order == "BA":
+                swap.append(offset)
+            elif word_order != "AB":
+                raise ValueError(f"Unknown word_order '{word_order}' for {key}")
+            if offset > pos:
+                fmt.append(f"{(offset - pos) * 2}x")
+            fmt.append("f")
+            pos = offset + REGISTERS_PER_VALUE
+        if count > pos:
+            fmt.append(f"{(count - pos) * 2}x")
+
+        self.count = count
+        self.keys = tuple(field[0] for field in fields)
+        self._ends = tuple(field[1] + REGISTERS_PER_VALUE for field in fields)
+        self._pack = struct.Struct(f">{count}H").pack
+        self._unpack = struct.Struct("".join(fmt)).unpack
+        self._swap = tuple(swap)
+        self._precisions = tuple(field[3] for field in fields)
+
+    def decode(self, registers: list) -> dict:
+        """Decode a block response into {key: value}, NaN becomes None."""
+        received = len(registers)
+        if received != self.count or self._swap:
+            registers = list(registers[: self.count])
+            registers.extend([_NAN_WORD] * (self.count - len(registers)))
+            for offset in self._swap:
+                registers[offset], registers[offset + 1] = (
+                    registers[offset + 1],
+                    registers[offset],
+                )
+
+        values = self._unpack(self._pack(*registers))
+        data = {
+            key: None if math.isnan(value) else round(value, precision)
+            for key, value, precision in zip(self.keys, values, self._precisions)
+        }
+        if received < self.count:
+            # Truncated frame: only report values that were fully received
+            for key, end in zip(self.keys, self._ends):
+                if end > received:
+                    del data[key]
+        return data
+
+
+class ReadBlock(NamedTuple):
+    """A single read request and the keys decoded from it."""
+
+    start: int
+    count: int
+    keys: tuple  # ((key, register offset within block), ...)
+    decoder: BlockDecoder
+
+
+def plan_reads(
+    reg_map: dict,
+    max_registers: int = MODBUS_MAX_READ_REGISTERS,
+    frame_overhead: int = DEFAULT_FRAME_OVERHEAD,
+) -> list[ReadBlock]:
+    """Coalesce register addresses into as few read requests as possible.
+
+    Addresses are merged into one block as long as the block stays within
+    max_registers and the unused gap being read over costs less than a
+    separate request would (see DEFAULT_FRAME_OVERHEAD). Every block comes
+    with a precompiled decoder for its response.
+    """
+    return _plan_specs(_compile_specs(reg_map), max_registers, frame_overhead)
+
+
+@lru_cache(maxsize=64)
+def plan_register_set(
+    name: str,
+    tiers: frozenset,
+    max_registers: int = MODBUS_MAX_READ_REGISTERS,
+    keys: frozenset | None = None,
+    frame_overhead: int = DEFAULT_FRAME_OVERHEAD,
+) -> tuple:
+    """Memoized read plan for the given tiers of a register set.
+
+    Plans only depend on the register set, the polled keys (None for all)
+    and the hub's block size, so all meters with the same profile share the
+    blocks and their decoders.
+    """
+    specs = [
+        spec
+        for spec in compile_register_set(name).specs
+        if spec.tier in tiers and (keys is None or spec.key in keys)
+    ]
+    return tuple(_plan_specs(specs, max_registers, frame_overhead))
+
+
+def _plan_specs(specs, max_registers: int, frame_overhead: int) -> list[ReadBlock]:
+    """Plan reads for RegisterSpecs sorted by address."""
+    max_registers = max(
+        REGISTERS_PER_VALUE, min(max_registers, MODBUS_MAX_READ_REGISTERS)
+    )
+
+    blocks = []
+    start = None
+    end = None  # first register after the current block
+    fields = []
+
+    for spec in specs:
+        addr = spec.address
+        if start is not None:
+            gap = addr - end
+            new_count = addr + REGISTERS_PER_VALUE - start
+            if gap <= frame_overhead and new_count <= max_registers:
+                fields.append((spec.key, addr - start, spec.word_order, spec.precision))
+                end = max(end, addr + REGISTERS_PER_VALUE)
+                continue
+            blocks.append(_make_block(start, end - start, fields))
+
+        start = addr
+        end = addr + REGISTERS_PER_VALUE
+        fields = [(spec.key, 0, spec.word_order, spec.precision)]
+
+    if start is not None:
+        blocks.append(_make_block(start, end - start, fields))
+
+    return blocks
+
+
+def _make_block(start: int, count: int, fields: list) -> ReadBlock:
+    keys = tuple((key, offset) for key, offset, _word_order, _precision in fields)
+    return ReadBlock(start, count, keys, BlockDecoder(count, fields))
+
+
+async def async_probe_max_registers(
+    read,
+    address: int,
+    upper: int = MODBUS_MAX_READ_REGISTERS,
+    lower: int = REGISTERS_PER_VALUE,
+) -> int | None:
+    """Binary search the largest block size a device/gateway reads reliably.
+
+    `read(address, count)` must return the list of registers or raise. A
+    response only counts as good when it contains exactly `count` registers,
+    which catches gateways that truncate or mangle large frames. Returns None
+    when even the smallest read fails (device unreachable).
+    """
+
+    async def _reads_ok(count: int) -> bool:
+        try:
+            registers = await read(address, count)
+        except Exception:  # noqa: BLE001 - any failure means "not reliable"
+            return False
+        return registers is not None and len(registers) == count
+
+    if not await _reads_ok(lower):
+        return None
+
+    if await _reads_ok(upper):
+        return upper
+
+    good, bad = lower, upper
+    while bad - good > 1:
+        mid = (good + bad) // 2
+        if await _reads_ok(mid):
+            good = mid
+        else:
+            bad = mid
+    return good
+
+
+def probe_window(reg_map: dict) -> tuple[int, int]:
+    """Return (address, count) of the largest block the planner builds for reg_map.
+
+    That range is known to be readable on the meter, so it is safe to probe
+    the gateway's block size limit against it.
+    """
+    block = max(plan_reads(reg_map), key=lambda b: b.count)
+    return block.start, block.count
@@ -0,0 +1,190 @@
+"""Replay transport: serve register reads from a recorded capture file.
+
+ReplayClient stands in for the pymodbus clients a hub uses, so the hub and
+coordinator run unchanged against recorded field data. Each request gets
+the next recorded response for its (slave, start, count), including
+exception responses, truncated frames and timeouts, either as fast as
+possible or in realtime: at the recorded time since the first record,
+relative to the replay start, and with the recorded latency.
+
+    capture = ReplayCapture.load("capture_xyz.sdmcap")
+    hub = SDM630TcpHub(hass, "replay", 0, client_factory=lambda: ReplayClient(capture))
+"""
+
+import asyncio
+from collections import defaultdict
+
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+from .capture import STATUS_ERROR, STATUS_EXCEPTION, CaptureReader
+
+
+class ReplayResponse:
+    """Read response with the attributes the integration uses."""
+
+    __slots__ = ("exception_code", "registers")
+
+    def __init__(self, registers: list, exception_code: int = 0) -> None:
+        self.registers = registers
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:
+        return self.exception_code != 0
+
+    def __str__(self) -> str:
+        if self.exception_code:
+            return f"ReplayResponse(exception_code={self.exception_code})"
+        return f"ReplayResponse({len(self.registers)} registers)"
+
+
+class ReplayCapture:
+    """A capture file indexed by request, shared by all clients replaying it."""
+
+    def __init__(self, records: list) -> None:
+        # (slave, start, count) ->
+        #     [(offset, status, exception_code, duration, registers), ...]
+        # with offset the request time since the first record
+        self._responses = defaultdict(list)
+        self._cursors = defaultdict(int)  # per requested (slave, start, count)
+        self._laps = defaultdict(int)  # times the cursor wrapped around, when looping
+        self._covering = {}  # requested key -> recorded key covering it
+        first = min((record[0] for record in records), default=0.0)
+        # Length of one pass over the recording, the offset added per lap
+        self.span = max(
+            (record[0] - first + record[6] for record in records), default=0.0
+        )
+        self.started = None  # loop time of the first realtime request
+        for (
+            timestamp,
+            slave,
+            start,
+            count,
+            status,
+            exception_code,
+            duration,
+            registers,
+        ) in records:
+            self._responses[(slave, start, count)].append(
+                (timestamp - first, status, exception_code, duration, registers)
+            )
+        self.records = len(records)
+
+    @classmethod
+    def load(cls, *paths) -> "ReplayCapture":
+        """Read capture files (oldest first) into memory. Blocking, use an executor in HA."""
+        records = []
+        for path in paths:
+            with CaptureReader(path) as reader:
+                records.extend(
+                    (
+                        record.time,
+                        record.slave,
+                        record.start,
+                        record.count,
+                        record.status,
+                        record.exception_code,
+                        record.duration,
+                        list(record.registers),
+                    )
+                    for record in reader
+                )
+        return cls(records)
+
+    def _recorded_key(self, key: tuple):
+        """Return the recorded request that answers key, None if nothing covers it."""
+        if key in self._responses:
+            return key
+        if key not in self._covering:
+            # Planned differently than when recording (e.g. another block size):
+            # answer from a recorded read that covers the requested range
+            slave, start, count = key
+            self._covering[key] = next(
+                (
+                    recorded
+                    for recorded in self._responses
+                    if recorded[0] == slave
+                    and recorded[1] <= start
+                    and recorded[1] + recorded[2] >= start + count
+                ),
+                None,
+            )
+        return self._covering[key]
+
+    def next_response(self, slave: int, start: int, count: int, loop: bool = True):
+        """Return the next recorded response or None.
+
+        The response is (offset, status, exception_code, duration, registers),
+        offset being the request time since the first record, one span later
+        for every time the recording was looped.
+        """
+        key = (slave, start, count)
+        recorded = self._recorded_key(key)
+        if recorded is None:
+            return None
+        responses = self._responses[recorded]
+        index = self._cursors[key]
+        if index >= len(responses):
+            if not loop:
+                return None
+            index = 0
+            self._laps[key] += 1
+        self._cursors[key] = index + 1
+        offset, status, exception_code, duration, registers = responses[index]
+        offset += self._laps[key] * self.span
+        if recorded != key:
+            first = start - recorded[1]
+            registers = registers[
+                first : first + count
+            ]  # stays short if the recording was
+        return offset, status, exception_code, duration, registers
+
+
+class ReplayClient:
+    """Drop-in for AsyncModbusTcpClient/AsyncModbusSerialClient backed by a capture."""
+
+    def __init__(
+        self,
+        capture: ReplayCapture,
+        realtime: bool = False,
+        speed: float = 1.0,
+        loop: bool = True,
+    ) -> None:
+        self.capture = capture
+        self.realtime = realtime
+        self.speed = speed
+        self.loop = loop
+        self.connected = False
+
+    async def connect(self) -> bool:
+        self.connected = True
+        return True
+
+    def close(self) -> None:
+        self.connected = False
+
+    async def read_input_registers(
+        self, address: int, count: int = 1, device_id: int = 1
+    ):
+        if not self.connected:
+            raise ConnectionException("Replay client not connected")
+        response = self.capture.next_response(device_id, address, count, self.loop)
+        if response is None:
+            raise ModbusIOException(
+                f"No recorded response for slave {device_id} at {address}+{count}"
+            )
+        offset, status, exception_code, duration, registers = response
+        if self.realtime:
+            # Wait for the recorded request time relative to the replay start,
+            # then for the recorded latency
+            now = asyncio.get_running_loop().time()
+            if self.capture.started is None:
+                self.capture.started = now
+            due = self.capture.started + offset / self.speed
+            await asyncio.sleep(max(due - now, 0) + duration / self.speed)
+        else:
+            await asyncio.sleep(0)  # just yield to the loop
+        if status == STATUS_ERROR:
+            raise ModbusIOException("No response received (replayed request failure)")
+        if status == STATUS_EXCEPTION:
+            return ReplayResponse([], exception_code or 4)  # 4: slave device failure
+        return ReplayResponse(list(registers))
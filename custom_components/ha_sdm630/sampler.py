@@ -0,0 +1,79 @@
+"""Array-backed ring buffers for high-rate sampling."""
+
+import math
+from array import array
+from typing import NamedTuple
+
+
+class SampleStats(NamedTuple):
+    """Aggregate of the samples taken during one publish window."""
+
+    min: float
+    max: float
+    mean: float
+    last: float
+    count: int
+
+
+class RingBuffer:
+    """Fixed-size float ring buffer that aggregates the samples since the last drain.
+
+    Samples live in a preallocated array of doubles, so sampling at a high
+    rate allocates nothing per sample. When more samples arrive than fit
+    between two drains, the oldest ones are overwritten.
+    """
+
+    __slots__ = ("_pending", "_pos", "_size", "_values", "last")
+
+    def __init__(self, size: int) -> None:
+        self._values = array("d", [math.nan]) * size
+        self._size = size
+        self._pos = 0
+        self._pending = 0  # samples since the last drain
+        self.last = None
+
+    def append(self, value: float) -> None:
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % self._size
+        self._pending = min(self._pending + 1, self._size)
+        self.last = value
+
+    def drain(self) -> SampleStats | None:
+        """Return the aggregate of the pending samples and start a new window."""
+        count = self._pending
+        if not count:
+            return None
+        self._pending = 0
+        start = self._pos - count
+        if count == self._size:
+            window = self._values
+        elif start >= 0:
+            window = self._values[start : self._pos]
+        else:
+            window = self._values[start:] + self._values[: self._pos]
+        return SampleStats(
+            min(window), max(window), math.fsum(window) / count, self.last, count
+        )
+
+
+class Sampler:
+    """One ring buffer per sampled register."""
+
+    def __init__(self, keys, size: int) -> None:
+        self._buffers = {key: RingBuffer(size) for key in keys}
+
+    def add(self, values: dict) -> None:
+        """Append decoded values, unknown keys and NaN (None) are ignored."""
+        buffers = self._buffers
+        for key, value in values.items():
+            if value is not None and key in buffers:
+                buffers[key].append(value)
+
+    def drain(self) -> dict:
+        """Return {key: SampleStats} for every register sampled since the last drain."""
+        stats = {}
+        for key, buffer in self._buffers.items():
+            window = buffer.drain()
+            if window is not None:
+                stats[key] = window
+        return stats
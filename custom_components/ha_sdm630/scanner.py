@@ -0,0 +1,137 @@
+"""Fast discovery of SDM630 meters on a bus, used by the config flow's scan step.
+
+A sweep probes every slave ID with one small read. Absent IDs are the
+common case, so what a scan costs is mostly timeouts: the timeout starts
+generous and, once a meter answers, drops to a multiple of the slowest
+answer seen. TCP gateways are probed over several connections at once.
+"""
+
+import asyncio
+import logging
+import time
+
+from pymodbus.exceptions import ModbusException
+
+_LOGGER = logging.getLogger(__name__)
+
+# Probe: L1 voltage, which every SDM630 answers
+PROBE_ADDRESS = 0
+PROBE_COUNT = 2
+
+# Response timeouts in seconds
+SCAN_MIN_TIMEOUT = 0.05
+SCAN_MAX_TIMEOUT = 1.0
+SCAN_TIMEOUT_FACTOR = 4  # times the slowest answer seen
+SCAN_TURNAROUND = 0.2  # meter processing allowance until the first answer
+SCAN_TCP_INITIAL_TIMEOUT = 0.5
+SCAN_TCP_LANES = 4  # concurrent connections to a TCP gateway
+
+# Request + response frame of a probe in RTU characters (11 bits each)
+_PROBE_FRAME_CHARS = 8 + 9
+
+
+def initial_serial_timeout(baudrate: int) -> float:
+    """Return the timeout for probing a serial bus before any meter answered."""
+    return min(SCAN_MAX_TIMEOUT, _PROBE_FRAME_CHARS * 11 / baudrate + SCAN_TURNAROUND)
+
+
+class BusScanner:
+    """Sweep slave IDs on one bus with short, adaptive timeouts.
+
+    Every client is one lane taking IDs from a shared queue: a serial port
+    gets one, a TCP gateway several so probes overlap.
+    """
+
+    def __init__(self, clients: list, initial_timeout: float) -> None:
+        self._clients = clients
+        self.timeout = initial_timeout
+        self._slowest = 0.0
+        self.found = {}  # slave ID -> response time in seconds
+
+    async def async_scan(self, slave_ids, expected: int = 0) -> dict:
+        """Probe slave_ids, stop early once `expected` meters answered (0: probe all).
+
+        Returns {slave ID: response time}, raises ConnectionError if no
+        client could connect.
+        """
+        lanes = [
+            client for client in self._clients if await self._async_connect(client)
+        ]
+        if not lanes:
+            raise ConnectionError("Failed to connect for the bus scan")
+        pending = iter(slave_ids)  # Shared, lanes take the next ID when they are free
+        await asyncio.gather(
+            *(self._async_lane(client, pending, expected) for client in lanes)
+        )
+        return dict(sorted(self.found.items()))
+
+    async def async_close(self) -> None:
+        for client in self._clients:
+            try:
+                client.close()
+            except Exception as err:  # noqa: BLE001 - only closing a scan client
+                _LOGGER.debug("Error closing scan client: %s", err)
+
+    @staticmethod
+    async def _async_connect(client) -> bool:
+        try:
+            await client.connect()
+        except Exception as err:  # noqa: BLE001 - a lane that can't connect is left out
+            _LOGGER.debug("Scan connect failed: %s", err)
+        return client.connected
+
+    async def _async_lane(self, client, pending, expected: int) -> None:
+        for slave_id in pending:
+            if expected and len(self.found) >= expected:
+                return
+            elapsed = await self._async_probe(client, slave_id)
+            if elapsed is None:
+                continue
+            self.found[slave_id] = elapsed
+            self._slowest = max(self._slowest, elapsed)
+            self.timeout = min(
+                SCAN_MAX_TIMEOUT,
+                max(SCAN_MIN_TIMEOUT, SCAN_TIMEOUT_FACTOR * self._slowest),
+            )
+            _LOGGER.debug(
+                f"Scan: slave {slave_id} answered in {elapsed * 1000:.0f} ms, timeout now {self.timeout:.3f} s"
+            )
+
+    async def _async_probe(self, client, slave_id: int) -> float | None:
+        """Return the response time if slave_id answers like an SDM630, else None."""
+        transaction = client.ctx
+        transaction.comm_params.timeout_connect = self.timeout
+        # Silent IDs are expected here, don't let pymodbus drop the link over them
+        transaction.count_until_disconnect = transaction.max_until_disconnect
+        start = time.monotonic()
+        try:
+            result = await client.read_input_registers(
+                address=PROBE_ADDRESS, count=PROBE_COUNT, device_id=slave_id
+            )
+        except ModbusException:
+            return None
+        # Exception responses come from gateways (target failed to respond) or other devices
+        if result.isError() or len(result.registers) != PROBE_COUNT:
+            return None
+        return time.monotonic() - start
+
+
+async def async_scan_serial(make_client, settings: list, slave_ids, expected: int = 0):
+    """Scan with each (baudrate, parity) in turn until one finds meters.
+
+    A bus runs at a single setting, so the remaining ones are skipped.
+    make_client(baudrate, parity, timeout) returns an unconnected client.
+    Returns ((baudrate, parity), {slave ID: response time}), (None, {}) if
+    nothing answered.
+    """
+    for baudrate, parity in settings:
+        timeout = initial_serial_timeout(baudrate)
+        scanner = BusScanner([make_client(baudrate, parity, timeout)], timeout)
+        try:
+            found = await scanner.async_scan(slave_ids, expected)
+        finally:
+            await scanner.async_close()
+        _LOGGER.debug(f"Scan at {baudrate} {parity}: {len(found)} meter(s)")
+        if found:
+            return (baudrate, parity), found
+    return None, {}
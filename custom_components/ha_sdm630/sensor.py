@@ -1,10 +1,23 @@
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
+import time
+
+from homeassistant.components.sensor import RestoreSensor, SensorEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .const import DOMAIN
+
+from .const import (
+    CONF_DEADBAND_SCALE,
+    CONF_MAX_STATE_AGE,
+    DEFAULT_DEADBAND_SCALE,
+    DEFAULT_MAX_STATE_AGE,
+    DIAGNOSTIC_SENSORS,
+    DOMAIN,
+)
 from .coordinator import HA_SDM630Coordinator
-from homeassistant.helpers.entity import DeviceInfo
+from .planner import register_deadband
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     coordinator: HA_SDM630Coordinator = hass.data[DOMAIN][entry.entry_id]
@@ -16,18 +29,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         configuration_url=f"homeassistant://config/integrations/integration/{entry.entry_id}",
     )
     # The coordinator already knows which registers to create
-    entities = [
-        HA_SDM630Sensor(coordinator, entry, key, info)
+    sensors = {
+        key: HA_SDM630Sensor(coordinator, entry, key, info)
         for key, info in coordinator.register_map.items()
+    }
+    entities = list(sensors.values()) + [
+        HA_SDM630DiagnosticSensor(coordinator, entry, key, info)
+        for key, info in DIAGNOSTIC_SENSORS.items()
+        if coordinator.hub_diagnostics or not info.get("hub")
     ]
     for entity in entities:
-            entity._attr_device_info = device_info
+        entity._attr_device_info = device_info
     async_add_entities(entities)
 
+    @callback
+    def _async_register_set_changed() -> None:
+        """Follow an in-place register set change: add new sensors, remove dropped ones."""
+        register_map = coordinator.register_map
+        for key in sensors.keys() - register_map.keys():
+            # Like a reload would: the registry entry stays, with its customizations
+            hass.async_create_task(sensors.pop(key).async_remove())
+        added = [
+            HA_SDM630Sensor(coordinator, entry, key, info)
+            for key, info in register_map.items()
+            if key not in sensors
+        ]
+        for sensor in added:
+            sensor._attr_device_info = device_info
+            sensors[sensor._key] = sensor
+        async_add_entities(added)
+
+    entry.async_on_unload(
+        coordinator.async_add_register_listener(_async_register_set_changed)
+    )
+
 
-class HA_SDM630Sensor(CoordinatorEntity, SensorEntity):  # ← Inherit from CoordinatorEntity
+class HA_SDM630Sensor(
+    CoordinatorEntity, RestoreSensor
+):  # ← Inherit from CoordinatorEntity
     """Representation of an SDM630 sensor."""
 
+    # Change with every write, recording them would store a new attributes row each time
+    _unrecorded_attributes = frozenset(
+        {"sample_age", "min", "max", "mean", "last", "samples"}
+    )
+
     def __init__(self, coordinator: HA_SDM630Coordinator, entry: ConfigEntry, key: str, info: dict):
         """Initialize the sensor."""
         super().__init__(coordinator)  # This handles update listening
@@ -37,13 +83,121 @@ class HA_SDM630Sensor(CoordinatorEntity, SensorEntity):  # ← Inherit from Coor
         self._attr_native_unit_of_measurement = info.get("unit")
         self._attr_device_class = info.get("device_class")
         self._attr_state_class = info.get("state_class")
+        self._attr_entity_registry_enabled_default = info.get("enabled_default", True)
+        # Only write state when the value moves past the deadband or the state gets old
+        self._deadband = register_deadband(
+            info, entry.options.get(CONF_DEADBAND_SCALE, DEFAULT_DEADBAND_SCALE)
+        )
+        self._max_state_age = entry.options.get(
+            CONF_MAX_STATE_AGE, DEFAULT_MAX_STATE_AGE
+        )
+        self._precision = info.get("precision", 2)
+        self._attr_native_value = (coordinator.data or {}).get(key)
+        self._written_available = None
+        self._written_stale = False
+        self._written_at = 0.0
 
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        return self.coordinator.data.get(self._key)
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state until the first poll, count HA's initial state write."""
+        await super().async_added_to_hass()
+        if (
+            self.coordinator.data is None
+            and (last := await self.async_get_last_sensor_data()) is not None
+        ):
+            self._attr_native_value = last.native_value
+        self._written_available = self.available
+        self._written_at = time.monotonic()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
+        if self.coordinator.data is None:
+            # Not polled yet: the restored state, until a first poll fails
+            return (
+                self.coordinator.last_update_success
+                and self._attr_native_value is not None
+            )
         return self.coordinator.last_update_success and self.coordinator.data.get(self._key) is not None
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Age of the sample behind the state (grows while reads fail), aggregates if sampled."""
+        attributes = {}
+        age = self.coordinator.sample_age(self._key)
+        if age is not None:
+            attributes["sample_age"] = round(age, 1)
+        stats = self.coordinator.aggregates.get(self._key)
+        if stats is not None:
+            attributes.update(
+                min=stats.min,
+                max=stats.max,
+                mean=round(stats.mean, self._precision),
+                last=stats.last,
+                samples=stats.count,
+            )
+        return attributes or None
+
+    def _within_deadband(self, value) -> bool:
+        """Return True if value is not worth a state write yet."""
+        last = self._attr_native_value
+        if value is None or last is None:
+            return value is last
+        if time.monotonic() - self._written_at >= self._max_state_age:
+            return False  # Heartbeat, keeps the recorder and "last updated" alive
+        absolute, relative = self._deadband
+        return abs(value - last) <= max(absolute, relative * abs(last))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only for meaningful changes."""
+        value = (self.coordinator.data or {}).get(self._key)
+        available = self.available
+        # Going stale is worth a write, so sample_age shows it despite the deadband
+        stale = self.coordinator.is_stale(self._key)
+        # Sampled registers publish once per update anyway, along with fresh min/max
+        sampled = self._key in self.coordinator.sampled_keys
+        if (
+            available == self._written_available
+            and stale == self._written_stale
+            and not sampled
+            and self._within_deadband(value)
+        ):
+            return
+        self._attr_native_value = value
+        self._written_available = available
+        self._written_stale = stale
+        self._written_at = time.monotonic()
+        self.async_write_ha_state()
+
+
+class HA_SDM630DiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Performance metric of the meter or its hub."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: HA_SDM630Coordinator,
+        entry: ConfigEntry,
+        key: str,
+        info: dict,
+    ):
+        super().__init__(coordinator)
+        self._key = key
+        self._precision = info.get("precision", 2)
+        self._attr_unique_id = f"{entry.entry_id}_diag_{key}"
+        self._attr_name = f"{entry.title} {info['name']}"
+        self._attr_native_unit_of_measurement = info.get("unit")
+        self._attr_device_class = info.get("device_class")
+        self._attr_state_class = info.get("state_class")
+        self._attr_entity_registry_enabled_default = info.get("enabled_default", True)
+
+    @property
+    def available(self) -> bool:
+        """Metrics stay available while polls fail, that is when they matter."""
+        return True
+
+    @property
+    def native_value(self):
+        value = self.coordinator.diagnostic_values().get(self._key)
+        return None if value is None else round(value, self._precision)
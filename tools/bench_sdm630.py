@@ -0,0 +1,333 @@
+"""End-to-end benchmark of the integration against simulated SDM630 meters.
+
+Starts tools/sdm630_sim.py on localhost, then drives the real hub and
+coordinator (Home Assistant must be installed) through every register set
+and reports:
+
+- cycle latency (p50/p95/max) of a full coordinator update
+- Modbus requests, registers and bytes on the wire per cycle
+- error recovery time: how long after a total outage ends until every
+  register is read again
+
+With --replay the hub reads from recorded capture files instead (see
+custom_components/ha_sdm630/replay.py), as fast as possible or with the
+recorded timing and latency (--realtime), and the report is based on the
+hub metrics.
+
+Examples:
+    python tools/bench_sdm630.py
+    python tools/bench_sdm630.py --latency 0.03 --gateway-limit 4 --meters 3
+    python tools/bench_sdm630.py --truncate-rate 0.05 --outage 0 --json
+    python tools/bench_sdm630.py --replay capture_xyz.sdmcap --register-sets full --cycles 5000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_ROOT))
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import frame
+from sdm630_sim import SDM630Simulator, fault_args, faults_from_args
+
+from custom_components.ha_sdm630 import SDM630TcpHub
+from custom_components.ha_sdm630.const import (
+    DEFAULT_MEDIUM_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    REGISTER_SETS,
+    TIER_MEDIUM,
+    TIER_SLOW,
+)
+from custom_components.ha_sdm630.coordinator import HA_SDM630Coordinator
+from custom_components.ha_sdm630.planner import compile_register_set
+from custom_components.ha_sdm630.replay import ReplayCapture, ReplayClient
+
+_LOGGER = logging.getLogger("bench_sdm630")
+
+
+def _percentile(samples: list, pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+async def _cycle(coordinators: list, all_tiers: bool) -> float:
+    """Run one update on every meter concurrently, return the wall time."""
+    if all_tiers:
+        for coordinator in coordinators:
+            coordinator._tier_last_poll.clear()  # Poll every tier, makes register sets comparable
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(c._async_update_data() for c in coordinators), return_exceptions=True
+    )
+    return time.perf_counter() - start
+
+
+def _make_coordinators(hass, hub, register_set: str, args) -> list:
+    """One coordinator per simulated meter, tiered like a default config entry."""
+    return [
+        HA_SDM630Coordinator(
+            hass,
+            hub,
+            slave_id,
+            register_set,
+            timedelta(seconds=args.interval),
+            tier_intervals={
+                TIER_MEDIUM: DEFAULT_MEDIUM_INTERVAL,
+                TIER_SLOW: DEFAULT_SLOW_INTERVAL,
+            },
+        )
+        for slave_id in range(1, args.meters + 1)
+    ]
+
+
+def _all_fresh(coordinators: list, since: float) -> bool:
+    """True if every polled register of every meter was read after `since`."""
+    now = time.monotonic()
+    for coordinator in coordinators:
+        specs = compile_register_set(coordinator.register_set).specs
+        for key in (
+            spec.key for spec in specs if spec.tier in coordinator.tier_intervals
+        ):
+            age = coordinator.sample_age(key)
+            if age is None or now - age < since:
+                return False
+    return True
+
+
+async def _measure_recovery(sim, coordinators: list, args) -> float | None:
+    """Black out the meters for args.outage seconds, return seconds to full recovery."""
+    faults = sim.faults
+    drop_rate = faults.drop_rate
+    faults.drop_rate = 1.0
+    outage_end = time.monotonic() + args.outage
+    while time.monotonic() < outage_end:
+        await _cycle(coordinators, args.all_tiers)
+    faults.drop_rate = drop_rate
+
+    restored = time.monotonic()
+    while time.monotonic() - restored < args.recovery_timeout:
+        await _cycle(coordinators, args.all_tiers)
+        if _all_fresh(coordinators, restored):
+            return time.monotonic() - restored
+        await asyncio.sleep(args.interval)
+    return None
+
+
+async def bench_register_set(hass, sim, register_set: str, args) -> dict:
+    """Benchmark one register set with a fresh hub, returns the result row."""
+    hub = SDM630TcpHub(hass, sim.host, sim.port, args.connections)
+    hub.set_register_cap("bench", args.max_registers)
+    coordinators = _make_coordinators(hass, hub, register_set, args)
+    try:
+        # Warm-up: connects and runs the block size probe
+        probe_start = sim.stats.requests
+        warmup = await _cycle(coordinators, args.all_tiers)
+        probe_requests = sim.stats.requests - probe_start
+
+        sim.stats.reset()
+        durations = [
+            await _cycle(coordinators, args.all_tiers) for _ in range(args.cycles)
+        ]
+        stats = sim.stats
+        row = {
+            "register_set": register_set,
+            "meters": args.meters,
+            "registers": len(REGISTER_SETS[register_set]),
+            "block_size": hub.max_registers,
+            "warmup_s": round(warmup, 4),
+            "warmup_requests": probe_requests,
+            "cycle_p50_ms": round(_percentile(durations, 50) * 1000, 2),
+            "cycle_p95_ms": round(_percentile(durations, 95) * 1000, 2),
+            "cycle_max_ms": round(max(durations) * 1000, 2),
+            "requests_per_cycle": round(stats.requests / args.cycles, 2),
+            "registers_per_cycle": round(stats.registers / args.cycles, 1),
+            "bytes_per_cycle": round(
+                (stats.bytes_in + stats.bytes_out) / args.cycles, 1
+            ),
+            "dropped": stats.dropped,
+            "truncated": stats.truncated,
+        }
+        if args.outage > 0:
+            recovery = await _measure_recovery(sim, coordinators, args)
+            row["recovery_s"] = None if recovery is None else round(recovery, 2)
+        return row
+    finally:
+        await hub.close()
+
+
+async def bench_replay(hass, capture, register_set: str, args) -> dict:
+    """Benchmark one register set replayed from a capture, returns the result row."""
+    hub = SDM630TcpHub(
+        hass,
+        "replay",
+        0,
+        args.connections,
+        client_factory=lambda: ReplayClient(capture, args.realtime),
+    )
+    hub.set_register_cap("bench", args.max_registers)
+    coordinators = _make_coordinators(hass, hub, register_set, args)
+    try:
+        warmup = await _cycle(coordinators, args.all_tiers)
+        metrics = hub.metrics
+        requests, failed, sleep_time = (
+            metrics.requests,
+            metrics.failed_requests,
+            metrics.sleep_time,
+        )
+
+        durations = [
+            await _cycle(coordinators, args.all_tiers) for _ in range(args.cycles)
+        ]
+        elapsed = sum(durations)
+        return {
+            "register_set": register_set,
+            "meters": args.meters,
+            "registers": len(REGISTER_SETS[register_set]),
+            "block_size": hub.max_registers,
+            "warmup_s": round(warmup, 4),
+            "cycle_p50_ms": round(_percentile(durations, 50) * 1000, 3),
+            "cycle_p95_ms": round(_percentile(durations, 95) * 1000, 3),
+            "cycle_max_ms": round(max(durations) * 1000, 3),
+            "cycles_per_s": round(args.cycles / elapsed, 1) if elapsed else None,
+            "requests_per_cycle": round((metrics.requests - requests) / args.cycles, 2),
+            "failed_requests": metrics.failed_requests - failed,
+            "sleep_s": round(metrics.sleep_time - sleep_time, 3),
+        }
+    finally:
+        await hub.close()
+
+
+def _print_table(rows: list) -> None:
+    columns = list(rows[0])
+    widths = [
+        max(len(col), *(len(str(row.get(col))) for row in rows)) for col in columns
+    ]
+    print("  ".join(col.ljust(width) for col, width in zip(columns, widths)))
+    for row in rows:
+        print(
+            "  ".join(
+                str(row.get(col)).ljust(width) for col, width in zip(columns, widths)
+            )
+        )
+
+
+async def _main_replay(args) -> list:
+    capture = ReplayCapture.load(*args.replay)
+    print(f"Replaying {capture.records} recorded reads", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        frame.async_setup(hass)
+        try:
+            return [
+                await bench_replay(hass, capture, register_set, args)
+                for register_set in (args.register_sets or list(REGISTER_SETS))
+            ]
+        finally:
+            await hass.async_stop(force=True)
+
+
+async def _main(args) -> None:
+    if args.replay:
+        rows = await _main_replay(args)
+    else:
+        rows = await _main_sim(args)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_table(rows)
+
+
+async def _main_sim(args) -> list:
+    sim = SDM630Simulator(
+        args.host, args.port, tuple(range(1, args.meters + 1)), faults_from_args(args)
+    )
+    await sim.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        frame.async_setup(hass)
+        try:
+            return [
+                await bench_register_set(hass, sim, register_set, args)
+                for register_set in (args.register_sets or list(REGISTER_SETS))
+            ]
+        finally:
+            await sim.stop()
+            await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the SDM630 integration against a simulator"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Simulator listen address")
+    parser.add_argument("--port", type=int, default=5020, help="Simulator listen port")
+    parser.add_argument(
+        "--register-sets",
+        nargs="+",
+        choices=list(REGISTER_SETS),
+        help="Register sets to run (default all)",
+    )
+    parser.add_argument(
+        "--meters", type=int, default=1, help="Simulated meters sharing the gateway"
+    )
+    parser.add_argument(
+        "--connections", type=int, default=1, help="TCP connections to the gateway"
+    )
+    parser.add_argument(
+        "--max-registers", type=int, default=125, help="Registers per request cap"
+    )
+    parser.add_argument(
+        "--cycles", type=int, default=50, help="Measured update cycles per register set"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=10,
+        help="Coordinator update interval in seconds",
+    )
+    parser.add_argument(
+        "--tiered",
+        dest="all_tiers",
+        action="store_false",
+        help="Keep the normal tier schedule instead of polling everything each cycle",
+    )
+    parser.add_argument(
+        "--outage",
+        type=float,
+        default=5.0,
+        help="Outage length for the recovery test, 0 to skip",
+    )
+    parser.add_argument(
+        "--recovery-timeout",
+        type=float,
+        default=120.0,
+        help="Give up waiting for recovery after this many seconds",
+    )
+    parser.add_argument(
+        "--replay",
+        nargs="+",
+        metavar="CAPTURE",
+        help="Replay capture files instead of running the simulator",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Replay with the recorded timing instead of as fast as possible",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    fault_args(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    asyncio.run(_main(args))
@@ -0,0 +1,356 @@
+"""Simulated SDM630 meter(s) behind a Modbus TCP server, with fault injection.
+
+Serves every register of the integration's "full" set with plausible,
+slowly changing values (respecting each register's word order) and can
+emulate the gateway misbehaviour the integration has to cope with:
+response latency, dropped frames, truncated responses and gateways that
+only handle a few registers per request.
+
+Run standalone:
+    python tools/sdm630_sim.py --port 5020 --slaves 1 2 3 --latency 0.02
+
+or start it from other tools with `await SDM630Simulator(...).start()`.
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import math
+import random
+import struct
+import sys
+import time
+import types
+from pathlib import Path
+
+from pymodbus.datastore import (
+    ModbusDeviceContext,
+    ModbusSequentialDataBlock,
+    ModbusServerContext,
+)
+from pymodbus.server import ModbusTcpServer
+
+# Load the integration's HA-free helpers without running its __init__ (which needs Home Assistant)
+_PKG = types.ModuleType("ha_sdm630")
+_PKG.__path__ = [
+    str(Path(__file__).resolve().parent.parent / "custom_components" / "ha_sdm630")
+]
+sys.modules.setdefault("ha_sdm630", _PKG)
+const = importlib.import_module("ha_sdm630.const")
+
+_LOGGER = logging.getLogger("sdm630_sim")
+
+FUNC_READ_INPUT_REGISTERS = 4
+# Input register space of the SDM630 covered by the register map (plus headroom)
+REGISTER_SPACE = 400
+MBAP_LEN = 7
+
+
+class FaultConfig:
+    """Faults to inject, all rates are probabilities per request."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        gateway_limit: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.truncate_rate = truncate_rate
+        # Requests above this many registers get a truncated answer, like cheap gateways
+        self.gateway_limit = gateway_limit
+
+
+class SimStats:
+    """Wire level counters, reset between benchmark runs."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.registers = 0
+        self.dropped = 0
+        self.truncated = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+def meter_values(elapsed: float, phase_shift: float = 0.0) -> dict:
+    """Plausible values for every key of the full register set at `elapsed` seconds."""
+    volts = [230 + 3 * math.sin(elapsed / 40 + i + phase_shift) for i in range(3)]
+    amps = [6 + 4 * math.sin(elapsed / 9 + 2 * i + phase_shift) for i in range(3)]
+    pfs = [0.97, 0.93, 0.95]
+    watts = [v * a * pf for v, a, pf in zip(volts, amps, pfs)]
+    vas = [v * a for v, a in zip(volts, amps)]
+    vars_ = [math.sqrt(max(va * va - w * w, 0.0)) for va, w in zip(vas, watts)]
+    import_kwh = [1000 + 150 * i + elapsed * w / 3.6e6 for i, w in enumerate(watts)]
+    export_kwh = [20 + 5 * i for i in range(3)]
+    import_kvarh = [300 + 40 * i + elapsed * q / 3.6e6 for i, q in enumerate(vars_)]
+    export_kvarh = [3 + i for i in range(3)]
+
+    values = {}
+    for i in range(3):
+        n = i + 1
+        values[f"phase_{n}_l_n_volts"] = volts[i]
+        values[f"phase_{n}_current"] = amps[i]
+        values[f"phase_{n}_power"] = watts[i]
+        values[f"phase_{n}_volt_amps"] = vas[i]
+        values[f"phase_{n}_volt_amps_reactive"] = vars_[i]
+        values[f"phase_{n}_power_factor"] = pfs[i]
+        values[f"phase_{n}_phase_angle"] = math.degrees(math.acos(pfs[i]))
+        values[f"phase_{n}_l_n_volts_thd"] = 1.5 + 0.2 * i
+        values[f"phase_{n}_current_thd"] = 8 + i
+        values[f"phase_{n}_current_demand"] = amps[i] * 0.9
+        values[f"maximum_phase_{n}_current_demand"] = amps[i] * 1.8
+        values[f"l{n}_import_active_energy"] = import_kwh[i]
+        values[f"l{n}_export_active_energy"] = export_kwh[i]
+        values[f"l{n}_total_active_energy"] = import_kwh[i] + export_kwh[i]
+        values[f"l{n}_import_reactive_energy"] = import_kvarh[i]
+        values[f"l{n}_export_reactive_energy"] = export_kvarh[i]
+        values[f"l{n}_total_reactive_energy"] = import_kvarh[i] + export_kvarh[i]
+    for a, b in ((1, 2), (2, 3), (3, 1)):
+        values[f"line_{a}_to_line_{b}_volts"] = (
+            (volts[a - 1] + volts[b - 1]) / 2 * math.sqrt(3)
+        )
+        values[f"line_{a}_to_line_{b}_volts_thd"] = 1.2
+
+    total_w, total_va, total_var = sum(watts), sum(vas), sum(vars_)
+    values.update(
+        {
+            "average_line_to_neutral_volts": sum(volts) / 3,
+            "average_line_current": sum(amps) / 3,
+            "sum_of_line_currents": sum(amps),
+            "neutral_current": abs(amps[0] - amps[1]) / 2,
+            "total_system_power": total_w,
+            "total_system_volt_amps": total_va,
+            "total_system_var": total_var,
+            "total_system_power_factor": total_w / total_va,
+            "total_system_power_factor_s": total_w / total_va,
+            "total_system_phase_angle": math.degrees(
+                math.acos(min(total_w / total_va, 1.0))
+            ),
+            "frequency": 50 + 0.02 * math.sin(elapsed / 5),
+            "import_energy": sum(import_kwh),
+            "export_energy": sum(export_kwh),
+            "total_kwh": sum(import_kwh) + sum(export_kwh),
+            "import_varh_since_last_reset": sum(import_kvarh),
+            "export_varh_since_last_reset": sum(export_kvarh),
+            "total_kvarh": sum(import_kvarh) + sum(export_kvarh),
+            "vah_since_last_reset": sum(import_kwh) * 1.05,
+            "ah_since_last_reset": 42000 + elapsed * sum(amps) / 3600,
+            "total_system_power_demand": total_w * 0.9,
+            "maximum_total_system_power_demand": total_w * 1.7,
+            "total_system_va_demand": total_va * 0.9,
+            "maximum_total_system_va_demand": total_va * 1.7,
+            "neutral_current_demand": 1.1,
+            "maximum_neutral_current_demand": 4.2,
+            "average_line_to_neutral_volts_thd": 1.7,
+            "average_line_current_thd": 9.0,
+            "average_line_to_line_volts_thd": 1.2,
+        }
+    )
+    return values
+
+
+def encode_registers(values: dict, reg_map: dict) -> dict:
+    """Return {address: [hi, lo]} for each key, honouring its word order."""
+    encoded = {}
+    for key, info in reg_map.items():
+        if key not in values:
+            continue
+        hi, lo = struct.unpack(">HH", struct.pack(">f", values[key]))
+        encoded[info["address"]] = (
+            [lo, hi] if info.get("word_order", "AB") == "BA" else [hi, lo]
+        )
+    return encoded
+
+
+class _SlowDeviceContext(ModbusDeviceContext):
+    """Device context that answers after the configured latency."""
+
+    def __init__(self, faults: FaultConfig, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._faults = faults
+
+    async def async_getValues(self, func_code, address, count=1):
+        delay = self._faults.latency + random.uniform(0, self._faults.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self.getValues(func_code, address, count)
+
+
+class SDM630Simulator:
+    """One Modbus TCP endpoint serving one or more simulated SDM630 meters."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 5020,
+        slave_ids: tuple = (1,),
+        faults: FaultConfig | None = None,
+        update_period: float = 1.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.faults = faults or FaultConfig()
+        self.stats = SimStats()
+        self.update_period = update_period
+        self._reg_map = const.REGISTER_SETS[const.REGISTER_SET_FULL]
+        # The device context maps protocol address n to block address n + 1, and
+        # newer pymodbus releases reject a block starting at 0
+        self._devices = {
+            slave_id: _SlowDeviceContext(
+                self.faults, ir=ModbusSequentialDataBlock(1, [0] * (REGISTER_SPACE + 1))
+            )
+            for slave_id in slave_ids
+        }
+        self._requested = {}  # transaction id -> requested register count
+        self._server = None
+        self._tasks = []
+        self._started = time.monotonic()
+
+    def refresh_values(self) -> None:
+        """Move every meter's values to the current simulated time."""
+        elapsed = time.monotonic() - self._started
+        for slave_id, device in self._devices.items():
+            for address, words in encode_registers(
+                meter_values(elapsed, slave_id), self._reg_map
+            ).items():
+                device.setValues(FUNC_READ_INPUT_REGISTERS, address, words)
+
+    def _trace_packet(self, sending: bool, data: bytes) -> bytes:
+        """Inject faults at the frame level (Modbus TCP framing)."""
+        if not sending:
+            self.stats.bytes_in += len(data)
+            if (
+                len(data) >= MBAP_LEN + 5
+                and data[MBAP_LEN] == FUNC_READ_INPUT_REGISTERS
+            ):
+                count = struct.unpack(">H", data[MBAP_LEN + 3 : MBAP_LEN + 5])[0]
+                self._requested[data[:2]] = count
+                self.stats.requests += 1
+                self.stats.registers += count
+            return data
+
+        count = self._requested.pop(data[:2], None)
+        faults = self.faults
+        if random.random() < faults.drop_rate:
+            self.stats.dropped += 1
+            return b""
+        if count is not None and data[MBAP_LEN] == FUNC_READ_INPUT_REGISTERS:
+            keep = None
+            if faults.gateway_limit is not None and count > faults.gateway_limit:
+                keep = faults.gateway_limit
+            elif count > 2 and random.random() < faults.truncate_rate:
+                keep = random.randrange(1, count)
+            if keep is not None:
+                self.stats.truncated += 1
+                data = _truncate_response(data, keep)
+        self.stats.bytes_out += len(data)
+        return data
+
+    async def start(self) -> None:
+        self.refresh_values()
+        context = ModbusServerContext(devices=self._devices, single=False)
+        self._server = ModbusTcpServer(
+            context,
+            address=(self.host, self.port),
+            trace_packet=self._trace_packet,
+        )
+        self._tasks.append(asyncio.create_task(self._server.serve_forever()))
+        self._tasks.append(asyncio.create_task(self._update_loop()))
+        # Give the listener a moment to bind
+        await asyncio.sleep(0.1)
+        _LOGGER.info(
+            "Simulating SDM630 slave(s) %s on %s:%s",
+            list(self._devices),
+            self.host,
+            self.port,
+        )
+
+    async def _update_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.update_period)
+            self.refresh_values()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._server is not None:
+            await self._server.shutdown()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+def _truncate_response(frame: bytes, registers: int) -> bytes:
+    """Cut a read response down to `registers` registers with consistent headers."""
+    payload = frame[MBAP_LEN + 2 : MBAP_LEN + 2 + 2 * registers]
+    header = frame[:4] + struct.pack(">H", 3 + len(payload)) + frame[6:MBAP_LEN]
+    return header + bytes([frame[MBAP_LEN], len(payload)]) + payload
+
+
+def fault_args(parser: argparse.ArgumentParser) -> None:
+    """Add the fault injection options to an argument parser."""
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Response latency in seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random extra latency in seconds"
+    )
+    parser.add_argument(
+        "--drop-rate", type=float, default=0.0, help="Probability a response is dropped"
+    )
+    parser.add_argument(
+        "--truncate-rate",
+        type=float,
+        default=0.0,
+        help="Probability a response is truncated",
+    )
+    parser.add_argument(
+        "--gateway-limit",
+        type=int,
+        default=None,
+        help="Truncate requests above this many registers",
+    )
+
+
+def faults_from_args(args) -> FaultConfig:
+    return FaultConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        truncate_rate=args.truncate_rate,
+        gateway_limit=args.gateway_limit,
+    )
+
+
+async def _main(args) -> None:
+    sim = SDM630Simulator(
+        args.host, args.port, tuple(args.slaves), faults_from_args(args)
+    )
+    await sim.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sim.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated SDM630 Modbus TCP server")
+    parser.add_argument("--host", default="127.0.0.1", help="Listen address")
+    parser.add_argument("--port", type=int, default=5020, help="Listen port")
+    parser.add_argument(
+        "--slaves", type=int, nargs="+", default=[1], help="Slave IDs to simulate"
+    )
+    fault_args(parser)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass